@@ -0,0 +1,38 @@
+# Small helpers shared by the generators and the analysis tools for reading and writing the benchmark JSONL files.
+
+import json
+
+from seed_words import SEED_WORDS_WITH_POS
+
+
+def read_jsonl(path):
+    # Loads a whole benchmark (or lm-eval samples) file into a list of dicts.
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def write_jsonl(items, path):
+    with open(path, "w", encoding="utf-8") as f:
+        for item in items:
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+
+
+# Older generated files do not carry a "pos" field. The generator walks SEED_WORDS_WITH_POS in order for every language,
+# so we recover the POS by walking the same list alongside the items of each language. This also resolves words that
+# appear twice with a different POS (e.g. "work" as NOUN and VERB).
+def attach_pos(items, seed_words=SEED_WORDS_WITH_POS):
+    cursor_by_lang = {}
+    for item in items:
+        if item.get("pos"):
+            continue
+        lang = item.get("target_lang")
+        cursor = cursor_by_lang.get(lang, 0)
+        for i in range(cursor, len(seed_words)):
+            word, pos = seed_words[i]
+            if word == item.get("source_word"):
+                item["pos"] = pos
+                cursor_by_lang[lang] = i + 1
+                break
+        else:
+            item["pos"] = ""
+    return items
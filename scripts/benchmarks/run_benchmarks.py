@@ -0,0 +1,247 @@
+# Performance regression benchmarks for the generation, data file and results aggregation stages.
+#
+# Every stage runs offline on synthetic inputs of fixed sizes:
+#   generation           generate_msi_benchmark_local.generate() against a stand-in lexical graph (stand_in_graph.py)
+#   jsonl_write          writing benchmark items as the .jsonl data files the lm_harness_tasks configs point to
+#   jsonl_load           loading those files back
+#   shard_lookup         single-item lookups in compressed, indexed shards (dataset_shards.py)
+#   results_aggregation  parse_results() of scripts/generate_figures/ plus the per-tier/model aggregation (needs pandas)
+#
+# For each stage we record throughput (items per second, best of --repeat runs), peak Python memory allocated by the stage (tracemalloc, in a
+# separate run so tracing does not slow the timed runs) and, for generation, backend queries per generated item.
+#
+# Usage:
+#   python scripts/benchmarks/run_benchmarks.py --save-baseline      # record the baseline of this machine
+#   python scripts/benchmarks/run_benchmarks.py                      # compare, exit code 1 on a regression
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.dirname(BENCHMARKS_DIR)
+sys.path.insert(0, SCRIPTS_DIR)
+sys.path.insert(0, os.path.join(SCRIPTS_DIR, "generate_figures"))
+
+from benchmark_io import read_jsonl, write_jsonl
+from dataset_shards import ShardedBenchmark, write_shards
+from stand_in_graph import StandInGraph, synthetic_seeds
+
+SIZES = {"seeds": 300, "jsonl_items": 50000, "shard_lookups": 5000, "result_files": 400}
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, "baseline.json")
+DEFAULT_THRESHOLD = 0.25  # relative change of throughput or memory that counts as a regression
+CALLS_TOLERANCE = 0.01  # backend queries are deterministic, so any real increase is a regression
+MEMORY_NOISE_MB = 1.0  # memory differences below this are ignored, whatever the relative change
+
+
+class Measure:
+    # Times the block; when tracemalloc is running, also records the peak memory the block allocated on top of what
+    # was already in use (so the prepared input does not count).
+
+    def __enter__(self):
+        self.in_use = 0
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self.in_use = tracemalloc.get_traced_memory()[0]
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self.start
+        self.peak_mb = None
+        if tracemalloc.is_tracing():
+            self.peak_mb = (tracemalloc.get_traced_memory()[1] - self.in_use) / 2 ** 20
+
+
+def synthetic_items(count):
+    rng = random.Random(0)
+    langs = ["ES", "DE", "SW", "HR", "JA"]
+    items = []
+    for i in range(count):
+        lang = langs[i % len(langs)]
+        answer = f"{lang.lower()}_word{i}"
+        choices = [answer] + [f"{lang.lower()}_other{rng.randrange(count)}" for _ in range(3)]
+        rng.shuffle(choices)
+        items.append({"task_id": f"MSI-EN-{lang}-{i:06d}", "task_type": "msi_custom_task", "source_word": f"word{i}",
+                      "source_lang": "EN", "target_lang": lang, "pos": ("NOUN", "VERB", "ADJ")[i % 3],
+                      "question": f"Which word has the same meaning as the 'word{i}' in {lang}?",
+                      "choices": choices, "answer": answer})
+    return items
+
+
+# Stages. Each one prepares its input in tmp_dir, measures only the work itself and returns its metrics.
+
+def stage_generation(tmp_dir):
+    import generate_msi_benchmark_local as generator
+
+    seeds = synthetic_seeds(SIZES["seeds"])
+    graph = StandInGraph(seeds)
+    generator.SEED_WORDS_WITH_POS = seeds
+    generator.OUTPUT_DIR = tmp_dir
+    generator.NEIGHBORHOOD_CACHE_PATH = os.path.join(tmp_dir, ".cache", "neighborhoods.json")
+    generator.WRITE_SHARDS = False
+    generator.use_babelnet(graph.as_babelnet())
+    random.seed(0)
+
+    with contextlib.redirect_stdout(io.StringIO()), Measure() as m:
+        generator.generate(list(generator.TASK_TYPES))
+
+    items = sum(len(read_jsonl(os.path.join(tmp_dir, name))) for name in os.listdir(tmp_dir) if name.endswith(".jsonl"))
+    return {"items": items, "seconds": m.seconds, "peak_mb": m.peak_mb,
+            "backend_calls_per_item": graph.calls / items}
+
+
+def stage_jsonl_write(tmp_dir):
+    items = synthetic_items(SIZES["jsonl_items"])
+    with Measure() as m:
+        write_jsonl(items, os.path.join(tmp_dir, "msi_benchmark_v2_high_resource.jsonl"))
+    return {"items": len(items), "seconds": m.seconds, "peak_mb": m.peak_mb}
+
+
+def stage_jsonl_load(tmp_dir):
+    path = os.path.join(tmp_dir, "msi_benchmark_v2_high_resource.jsonl")
+    write_jsonl(synthetic_items(SIZES["jsonl_items"]), path)
+    with Measure() as m:
+        items = read_jsonl(path)
+    return {"items": len(items), "seconds": m.seconds, "peak_mb": m.peak_mb}
+
+
+def stage_shard_lookup(tmp_dir):
+    items = synthetic_items(SIZES["jsonl_items"])
+    index_path = write_shards(items, tmp_dir, "msi_benchmark_v2_high_resource")
+    task_ids = [item["task_id"] for item in random.Random(0).sample(items, SIZES["shard_lookups"])]
+    with ShardedBenchmark(index_path) as benchmark, Measure() as m:
+        for task_id in task_ids:
+            benchmark.get(task_id)
+    return {"items": len(task_ids), "seconds": m.seconds, "peak_mb": m.peak_mb}
+
+
+def stage_results_aggregation(tmp_dir):
+    import create_results_visual
+    import create_fine_grained_resutls_visual
+
+    rng = random.Random(0)
+    tiers = {"hr": "high_resource", "mr": "medium_resource", "lr": "low_resource"}
+    poses = ("nouns", "verbs", "adjs")
+    for i in range(SIZES["result_files"]):
+        short, tier = list(tiers.items())[i % 3]
+        pos = poses[(i // 3) % 3]
+        # Half of the files are full-tier results (hr_...), half fine-grained POS results (hr-nouns_...)
+        prefix, task = (f"{short}", f"msi_custom_task_{tier}") if i % 2 else (f"{short}-{pos}", f"msi_custom_task_{tier}_{pos}")
+        data = {"results": {task: {"alias": task, "acc,none": rng.random(), "acc_stderr,none": 0.005}},
+                "n-samples": {task: {"original": 8364, "effective": 8364}},
+                "model_name": f"org/model-{i // 6}", "config": {"model": "hf"}}
+        with open(os.path.join(tmp_dir, f"{prefix}_model{i // 6}_results_2025-08-01T09-09-54.{i:06d}.json"), "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    with contextlib.redirect_stdout(io.StringIO()), Measure() as m:
+        tiers_df = create_results_visual.parse_results(tmp_dir)
+        tiers_df.groupby(["Language Tier", "Model"])["Accuracy"].mean()
+        fine_df = create_fine_grained_resutls_visual.parse_results(tmp_dir)
+        fine_df.groupby(["Language Tier", "Part of Speech", "Model"])["Accuracy"].mean()
+    return {"items": SIZES["result_files"], "seconds": m.seconds, "peak_mb": m.peak_mb}
+
+
+STAGES = {
+    "generation": stage_generation,
+    "jsonl_write": stage_jsonl_write,
+    "jsonl_load": stage_jsonl_load,
+    "shard_lookup": stage_shard_lookup,
+    "results_aggregation": stage_results_aggregation,
+}
+
+
+def run_stage(stage, repeat):
+    best = None
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            result = stage(tmp_dir)
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+
+    tracemalloc.start()
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            peak_mb = stage(tmp_dir)["peak_mb"]
+    finally:
+        tracemalloc.stop()
+
+    metrics = {"items": best["items"], "throughput": best["items"] / best["seconds"], "peak_memory_mb": peak_mb}
+    if "backend_calls_per_item" in best:
+        metrics["backend_calls_per_item"] = best["backend_calls_per_item"]
+    return metrics
+
+
+def find_regressions(results, baseline, threshold):
+    regressions = []
+    for name, metrics in results.items():
+        base = baseline.get(name)
+        if not base or metrics.get("skipped") or base.get("skipped"):
+            continue
+        if metrics["throughput"] < base["throughput"] * (1 - threshold):
+            regressions.append(f"{name}: throughput {metrics['throughput']:.1f}/s < baseline {base['throughput']:.1f}/s")
+        if metrics["peak_memory_mb"] > base["peak_memory_mb"] * (1 + threshold) and \
+                metrics["peak_memory_mb"] - base["peak_memory_mb"] > MEMORY_NOISE_MB:
+            regressions.append(f"{name}: peak memory {metrics['peak_memory_mb']:.1f} MB > baseline {base['peak_memory_mb']:.1f} MB")
+        if "backend_calls_per_item" in base and \
+                metrics["backend_calls_per_item"] > base["backend_calls_per_item"] * (1 + CALLS_TOLERANCE):
+            regressions.append(f"{name}: {metrics['backend_calls_per_item']:.3f} backend calls per item > baseline "
+                               f"{base['backend_calls_per_item']:.3f}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline performance regression benchmarks.")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage, the best one counts.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative throughput drop / memory growth that fails the run (default 0.25).")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.stages:
+        try:
+            results[name] = run_stage(STAGES[name], args.repeat)
+        except ImportError as e:
+            # results_aggregation needs pandas (requirements.txt); report it instead of failing the other stages
+            if e.name != "pandas":
+                raise
+            results[name] = {"skipped": f"missing dependency: {e.name}"}
+            print(f"{name:<20} SKIPPED ({results[name]['skipped']})")
+            continue
+        m = results[name]
+        calls = f" | {m['backend_calls_per_item']:.3f} backend calls/item" if "backend_calls_per_item" in m else ""
+        print(f"{name:<20} {m['items']:>7} items | {m['throughput']:>11.1f} items/s | {m['peak_memory_mb']:>7.1f} MB peak{calls}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"sizes": SIZES, "stages": results}, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        sys.exit(0)
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline first.")
+        sys.exit(0)
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("sizes") != SIZES:
+        print(f"\nBaseline was recorded with other input sizes {baseline.get('sizes')}; record a new one with --save-baseline.")
+        sys.exit(1)
+
+    regressions = find_regressions(results, baseline["stages"], args.threshold)
+    if regressions:
+        print(f"\nPERFORMANCE REGRESSION (threshold {args.threshold:.0%}):")
+        for regression in regressions:
+            print(f"  - {regression}")
+        sys.exit(1)
+    print(f"\nNo regression against {args.baseline} (threshold {args.threshold:.0%}).")
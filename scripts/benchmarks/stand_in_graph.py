@@ -0,0 +1,92 @@
+# A small, deterministic stand-in for the BabelNet lexical graph, used by the performance benchmarks.
+#
+# It exposes the part of the pybabelnet API that generate_msi_benchmark_local.py uses (get_senses, get_synset,
+# main_sense, outgoing_edges and the enums), so the generator runs offline and its query count can be measured.
+
+import zlib
+from types import SimpleNamespace
+
+HYPERNYM = "ANY_HYPERNYM"
+MERONYM = "ANY_MERONYM"
+
+
+def _stable_hash(*parts):
+    return zlib.crc32("|".join(parts).encode("utf-8"))
+
+
+class _Enum:
+    # Language[code], POS[name] and BabelSenseSource.WN just hand the name back
+    def __getitem__(self, name):
+        return name
+
+    def __getattr__(self, name):
+        return name
+
+
+class _Sense:
+    def __init__(self, full_lemma, synset_id):
+        self.full_lemma = full_lemma
+        self.synset_id = synset_id
+
+
+class _Edge:
+    def __init__(self, target):
+        self.target = target
+
+
+class _Synset:
+    def __init__(self, graph, synset_id):
+        self.id = synset_id
+        self._graph = graph
+
+    def main_sense(self, lang_code):
+        # About one language in ten has no sense for a synset, like the sparse coverage of real low-resource languages
+        if _stable_hash(self.id, lang_code) % 10 == 0:
+            return None
+        return _Sense(f"{lang_code.lower()}_{self.id}", self.id)
+
+    def outgoing_edges(self, relation):
+        return [_Edge(target) for target in self._graph.edges.get((self.id, relation), [])]
+
+
+class StandInGraph:
+    # seeds: list of (word, POS). Every seed gets a synset with 0-4 hypernyms and 0-4 meronyms, drawn from a shared pool
+    # of related concepts (so, as in BabelNet, neighborhoods overlap and synsets are reused across seeds).
+
+    def __init__(self, seeds):
+        self.seeds = seeds
+        self.calls = 0
+        pool_size = max(1, len(seeds) // 2)
+        self.edges = {}
+        for word, pos in seeds:
+            synset_id = self.seed_synset(word, pos)
+            for relation in (HYPERNYM, MERONYM):
+                count = _stable_hash(synset_id, relation) % 5
+                self.edges[(synset_id, relation)] = [
+                    f"bn:related{_stable_hash(synset_id, relation, str(i)) % pool_size:06d}" for i in range(count)
+                ]
+
+    @staticmethod
+    def seed_synset(word, pos):
+        return f"bn:{word}.{pos}"
+
+    def get_senses(self, word, from_langs=None, poses=None, sources=None):
+        self.calls += 1
+        pos = poses[0] if poses else "NOUN"
+        return [_Sense(word, self.seed_synset(word, pos))]
+
+    def get_synset(self, synset_id):
+        self.calls += 1
+        return _Synset(self, str(synset_id))
+
+    def as_babelnet(self):
+        # Same shape as generate_msi_benchmark_local.load_babelnet()
+        enum = _Enum()
+        return SimpleNamespace(bn=self, Language=enum, POS=enum, BabelSenseSource=enum,
+                               BabelPointer=SimpleNamespace(ANY_HYPERNYM=HYPERNYM, ANY_MERONYM=MERONYM),
+                               BabelSynsetID=str)
+
+
+def synthetic_seeds(count):
+    poses = ("NOUN", "VERB", "ADJ")
+    return [(f"word{i:05d}", poses[i % len(poses)]) for i in range(count)]
@@ -0,0 +1,270 @@
+# Builds a stratified "lite" version of every tier of the MSI benchmark for quick checks of new checkpoints.
+#
+# Items are grouped into strata of language x POS x difficulty and every stratum keeps the same share of its items
+# (proportional allocation), so the plain mean accuracy that lm_eval reports on the lite file stays an unbiased estimate
+# of the full-tier accuracy. Difficulty and item quality come from the per-sample logs of earlier runs
+# (lm_eval --log_samples, see sample_logs.py): inside a stratum we greedily keep the items that reproduce every known
+# model's accuracy on that stratum. Without per-sample logs the strata are language x POS and items are drawn at random.
+#
+# The script writes data/lite/msi_benchmark_v2_<tier>_lite.jsonl, a matching lm_harness_tasks/msi_<hr|mr|lr>_custom_task_lite.yaml
+# and reports how well the lite scores correlate with the full scores (in-sample and leave-one-model-out).
+#
+# Usage:
+#   python scripts/build_lite_subset.py --fraction 0.15
+
+import argparse
+import json
+import math
+import os
+import random
+
+from benchmark_io import attach_pos, read_jsonl, write_jsonl
+from sample_logs import TIER_SHORT_NAMES, item_key, load_sample_logs
+
+DEFAULT_FRACTION = 0.15  # ~6.7x cheaper than the full run
+EASY_THRESHOLD = 2 / 3  # share of models answering correctly above which an item counts as easy
+HARD_THRESHOLD = 1 / 3
+
+LITE_TASK_TEMPLATE = """# In lm_harness_tasks/msi_{short}_custom_task_lite.yaml
+# Generated by scripts/build_lite_subset.py - a stratified {percent}% subset of {full_file}
+
+# This name must match the --tasks argument in your command
+task: msi_custom_task_{tier}_lite
+
+# This tells the loader to use the built-in 'json' script for loading files.
+dataset_path: json
+
+# These are the arguments passed directly to the json loader.
+dataset_kwargs:
+  # We explicitly map our file to the "test" split, which the evaluator looks for.
+  data_files:
+    test: "{lite_file}"
+
+test_split: "test"
+
+output_type: multiple_choice
+
+doc_to_text: "{{{{question}}}}"
+doc_to_choice: "{{{{choices}}}}"
+doc_to_target: "{{{{answer}}}}"
+
+metric_list:
+  - metric: acc
+    aggregation: mean
+    higher_is_better: true
+
+metadata:
+  version: 1.0
+"""
+
+
+# Statistics helpers
+
+def mean(values):
+    values = list(values)
+    return sum(values) / len(values) if values else float("nan")
+
+
+def pearson(xs, ys):
+    if len(xs) < 2:
+        return float("nan")
+    mx, my = mean(xs), mean(ys)
+    sxy = sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+    sxx = sum((x - mx) ** 2 for x in xs)
+    syy = sum((y - my) ** 2 for y in ys)
+    if sxx == 0 or syy == 0:
+        return float("nan")
+    return sxy / math.sqrt(sxx * syy)
+
+
+def _ranks(values):
+    # Average ranks, so ties do not depend on input order.
+    order = sorted(range(len(values)), key=lambda i: values[i])
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2
+        i = j + 1
+    return ranks
+
+
+def spearman(xs, ys):
+    return pearson(_ranks(xs), _ranks(ys))
+
+
+# Subset selection
+
+def full_accuracies(items, correctness, models):
+    return {m: mean(correctness[item_key(item)][m] for item in items
+                    if m in correctness.get(item_key(item), {})) for m in models}
+
+
+def difficulty(key, correctness, models):
+    scores = [correctness[key][m] for m in models if m in correctness.get(key, {})]
+    if not scores:
+        return "unrated"
+    p = mean(scores)
+    if p >= EASY_THRESHOLD:
+        return "easy"
+    if p < HARD_THRESHOLD:
+        return "hard"
+    return "medium"
+
+
+def pick_representative(members, correctness, models, count, rng):
+    # Greedily picks items so that every model's accuracy on the picked items stays as close as possible to its
+    # accuracy on the whole stratum. Items without results for a model count as neutral for that model.
+    targets = {m: mean(correctness[item_key(item)][m] for item in members
+                       if m in correctness.get(item_key(item), {})) for m in models}
+    targets = {m: t for m, t in targets.items() if not math.isnan(t)}
+    rows = [(item, {m: correctness.get(item_key(item), {}).get(m, t) for m, t in targets.items()}, rng.random())
+            for item in members]
+
+    picked, sums = [], {m: 0.0 for m in targets}
+    while rows and len(picked) < count:
+        k = len(picked) + 1
+
+        def error(row):
+            return sum(((sums[m] + row[1][m]) / k - t) ** 2 for m, t in targets.items())
+
+        best = min(rows, key=lambda row: (error(row), row[2]))
+        rows.remove(best)
+        picked.append(best[0])
+        for m in targets:
+            sums[m] += best[1][m]
+    return picked
+
+
+def allocate(stratum_sizes, budget):
+    # Largest-remainder proportional allocation of the budget over the strata.
+    total = sum(stratum_sizes.values())
+    quotas = {s: budget * size / total for s, size in stratum_sizes.items()}
+    allocation = {s: int(q) for s, q in quotas.items()}
+    leftover = budget - sum(allocation.values())
+    for s in sorted(quotas, key=lambda s: (allocation[s] - quotas[s], s))[:leftover]:
+        allocation[s] += 1
+    return allocation
+
+
+def select_lite_items(items, correctness, models, fraction, seed=42):
+    rng = random.Random(seed)
+    strata = {}
+    for item in items:
+        stratum = (item["target_lang"], item.get("pos", ""), difficulty(item_key(item), correctness, models))
+        strata.setdefault(stratum, []).append(item)
+
+    budget = max(1, round(fraction * len(items)))
+    allocation = allocate({s: len(members) for s, members in strata.items()}, budget)
+
+    selected_ids = set()
+    for stratum, members in strata.items():
+        picked = pick_representative(members, correctness, models, allocation[stratum], rng)
+        selected_ids.update(item["task_id"] for item in picked)
+    return [item for item in items if item["task_id"] in selected_ids]
+
+
+def lite_scores(lite_items, correctness, models):
+    return full_accuracies(lite_items, correctness, models)
+
+
+def validate(items, correctness, models, fraction, seed):
+    # Compares lite and full scores in-sample and with each model held out of the item selection.
+    report = {"models": models, "full": full_accuracies(items, correctness, models)}
+    if not models:
+        return report
+
+    lite_items = select_lite_items(items, correctness, models, fraction, seed)
+    report["lite_in_sample"] = lite_scores(lite_items, correctness, models)
+
+    held_out = {}
+    for model in models:
+        others = [m for m in models if m != model]
+        held_out_items = select_lite_items(items, correctness, others, fraction, seed)
+        held_out[model] = lite_scores(held_out_items, correctness, [model])[model]
+    report["lite_held_out"] = held_out
+
+    full = [report["full"][m] for m in models]
+    for name in ("lite_in_sample", "lite_held_out"):
+        lite = [report[name][m] for m in models]
+        report[f"{name}_pearson"] = pearson(full, lite)
+        report[f"{name}_spearman"] = spearman(full, lite)
+        report[f"{name}_max_abs_error"] = max(abs(f - l) for f, l in zip(full, lite))
+    return report
+
+
+def is_full_msi_record(record):
+    # Only samples of the full MSI tasks count: the other task types (hypernym, meronym, translation) and earlier lite
+    # runs would bring in models without a full-tier accuracy and make the correlation check circular
+    return record["doc"].get("task_type") == "msi_custom_task" and not record["task"].endswith("_lite")
+
+
+def build_correctness(records, tier):
+    correctness = {}
+    for record in records:
+        if record["tier"] == tier and is_full_msi_record(record):
+            correctness.setdefault(item_key(record["doc"]), {})[record["model"]] = record["correct"]
+    return correctness
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build stratified lite subsets of the MSI benchmark tiers.")
+    parser.add_argument("--data-dir", default="./data")
+    parser.add_argument("--results-dir", default="./results")
+    parser.add_argument("--tasks-dir", default="./lm_harness_tasks")
+    parser.add_argument("--fraction", type=float, default=DEFAULT_FRACTION)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    records = load_sample_logs(args.results_dir)
+    if not records:
+        print(f"No per-sample logs (samples_*.jsonl) found in {args.results_dir}. Strata will not use difficulty "
+              f"and no correlation can be reported. Run lm_eval with --log_samples to enable both.")
+
+    lite_dir = os.path.join(args.data_dir, "lite")
+    os.makedirs(lite_dir, exist_ok=True)
+    full_report = {}
+
+    for tier, short in TIER_SHORT_NAMES.items():
+        full_file = os.path.join(args.data_dir, f"msi_benchmark_v2_{tier}.jsonl")
+        if not os.path.exists(full_file):
+            print(f"Skipping {tier}: {full_file} not found.")
+            continue
+
+        items = attach_pos(read_jsonl(full_file))
+        correctness = build_correctness(records, tier)
+        models = sorted({m for per_model in correctness.values() for m in per_model})
+
+        lite_items = select_lite_items(items, correctness, models, args.fraction, args.seed)
+        lite_file = os.path.join(lite_dir, f"msi_benchmark_v2_{tier}_lite.jsonl")
+        write_jsonl(lite_items, lite_file)
+
+        yaml_path = os.path.join(args.tasks_dir, f"msi_{short}_custom_task_lite.yaml")
+        with open(yaml_path, "w", encoding="utf-8") as f:
+            f.write(LITE_TASK_TEMPLATE.format(
+                short=short, tier=tier, percent=round(100 * args.fraction),
+                full_file=f"data/msi_benchmark_v2_{tier}.jsonl",
+                lite_file=f"data/lite/msi_benchmark_v2_{tier}_lite.jsonl",
+            ))
+
+        print(f"\n--- TIER {tier.upper()} ---")
+        print(f"Selected {len(lite_items)} of {len(items)} items ({len(items) / len(lite_items):.1f}x cheaper). "
+              f"Saved to {lite_file} and {yaml_path}")
+
+        report = validate(items, correctness, models, args.fraction, args.seed)
+        full_report[tier] = report
+        for model in models:
+            print(f"  {model}: full {report['full'][model]:.3f} | lite {report['lite_in_sample'][model]:.3f} "
+                  f"| lite (held out) {report['lite_held_out'][model]:.3f}")
+        if models:
+            print(f"  Pearson r full vs lite: {report['lite_in_sample_pearson']:.3f} in-sample, "
+                  f"{report['lite_held_out_pearson']:.3f} held-out | "
+                  f"Spearman: {report['lite_in_sample_spearman']:.3f} / {report['lite_held_out_spearman']:.3f}")
+
+    report_path = os.path.join(lite_dir, "lite_subset_report.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(full_report, f, indent=2)
+    print(f"\nCorrelation report saved to {report_path}")
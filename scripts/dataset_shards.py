@@ -0,0 +1,246 @@
+# Compressed, indexed shards for the benchmark files.
+#
+# A tier file (e.g. msi_benchmark_v2_high_resource.jsonl) is split into size-bounded gzip shards. Every shard is a
+# sequence of independent gzip members ("blocks") of a few dozen records each, so one item can be read by seeking to its
+# block and decompressing only that block. A sidecar .idx file maps task_id, target_lang and POS to (shard, block offset,
+# block length, line in block). The index holds two sorted tables of fixed-width records that the reader memory-maps: one
+# sorted by task_id for single items, and one sorted by (target_lang, POS, position in the shards) for language/POS
+# slices. Both lookups are binary searches over the mapped file and nothing else is loaded up front.
+#
+# Layout produced for a stem like "msi_benchmark_v2_high_resource":
+#   <out_dir>/msi_benchmark_v2_high_resource.idx
+#   <out_dir>/msi_benchmark_v2_high_resource-00000.jsonl.gz
+#   <out_dir>/msi_benchmark_v2_high_resource-00001.jsonl.gz ...
+#
+# Usage:
+#   python scripts/dataset_shards.py build data/msi_benchmark_v2_high_resource.jsonl --out-dir data/shards
+#   python scripts/dataset_shards.py get data/shards/msi_benchmark_v2_high_resource.idx MSI-EN-ES-0001
+#   python scripts/dataset_shards.py slice data/shards/msi_benchmark_v2_high_resource.idx --lang DE --pos VERB
+
+import argparse
+import bisect
+import gzip
+import json
+import mmap
+import os
+import struct
+
+from benchmark_io import attach_pos, read_jsonl
+
+SHARD_MAX_BYTES = 8 * 1024 * 1024  # compressed size after which a new shard is started
+BLOCK_RECORDS = 64  # records per gzip member; smaller blocks mean cheaper single-item reads but worse compression
+
+INDEX_MAGIC = b"MSIIDX02"
+INDEX_HEADER = struct.Struct("<8sII")  # magic, number of records, number of shards
+# task_id, target_lang, pos, shard number, block offset, block length, line inside the block
+INDEX_RECORD = struct.Struct("<24s4s4sHQII")
+# Slice section, right after the task_id records: target_lang, pos, shard number, block offset, block length, line
+SLICE_RECORD = struct.Struct("<4s4sHQII")
+
+
+def _shard_name(stem, shard_no):
+    return f"{stem}-{shard_no:05d}.jsonl.gz"
+
+
+def _encode(value, width, field):
+    raw = (value or "").encode("utf-8")
+    if len(raw) > width:
+        raise ValueError(f"{field} '{value}' is longer than {width} bytes and does not fit in the index")
+    return raw
+
+
+def write_shards(items, out_dir, stem, shard_max_bytes=SHARD_MAX_BYTES, block_records=BLOCK_RECORDS):
+    # Writes the items as compressed shards plus the .idx file and returns the index path.
+    os.makedirs(out_dir, exist_ok=True)
+    attach_pos(items)
+
+    entries = []
+    shard_no = 0
+    shard_file = open(os.path.join(out_dir, _shard_name(stem, shard_no)), "wb")
+    try:
+        for start in range(0, len(items), block_records):
+            block = items[start:start + block_records]
+            payload = "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in block)
+            member = gzip.compress(payload.encode("utf-8"), mtime=0)
+
+            if shard_file.tell() and shard_file.tell() + len(member) > shard_max_bytes:
+                shard_file.close()
+                shard_no += 1
+                shard_file = open(os.path.join(out_dir, _shard_name(stem, shard_no)), "wb")
+
+            offset = shard_file.tell()
+            shard_file.write(member)
+            for line_no, item in enumerate(block):
+                entries.append((
+                    _encode(item["task_id"], 24, "task_id"),
+                    _encode(item.get("target_lang"), 4, "target_lang"),
+                    _encode(item.get("pos"), 4, "pos"),
+                    shard_no, offset, len(member), line_no,
+                ))
+    finally:
+        shard_file.close()
+
+    entries.sort(key=lambda entry: entry[0])
+    for previous, current in zip(entries, entries[1:]):
+        if previous[0] == current[0]:
+            raise ValueError(f"Duplicate task_id '{current[0].decode('utf-8')}' cannot be indexed")
+
+    # Fixed-width fields are zero-padded, so sorting the raw (lang, pos) bytes groups each language and then each POS
+    slice_entries = sorted((lang.ljust(4, b"\0"), pos.ljust(4, b"\0")) + tuple(location)
+                           for _, lang, pos, *location in entries)
+
+    index_path = os.path.join(out_dir, f"{stem}.idx")
+    with open(index_path, "wb") as f:
+        f.write(INDEX_HEADER.pack(INDEX_MAGIC, len(entries), shard_no + 1))
+        for entry in entries:
+            f.write(INDEX_RECORD.pack(*entry))
+        for entry in slice_entries:
+            f.write(SLICE_RECORD.pack(*entry))
+    return index_path
+
+
+class ShardedBenchmark:
+    # Read-only access to a sharded benchmark through its memory-mapped index.
+
+    def __init__(self, index_path):
+        self.index_path = index_path
+        self.out_dir = os.path.dirname(os.path.abspath(index_path))
+        self.stem = os.path.basename(index_path)[:-len(".idx")]
+        self._file = open(index_path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, self.num_shards = INDEX_HEADER.unpack_from(self._map, 0)
+        if magic != INDEX_MAGIC:
+            self.close()
+            raise ValueError(f"{index_path} is not a benchmark shard index of this version, rebuild it with 'build'")
+        self._slice_start = INDEX_HEADER.size + self._count * INDEX_RECORD.size
+
+    def __len__(self):
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def _record(self, i):
+        return INDEX_RECORD.unpack_from(self._map, INDEX_HEADER.size + i * INDEX_RECORD.size)
+
+    def _key(self, i):
+        start = INDEX_HEADER.size + i * INDEX_RECORD.size
+        return self._map[start:start + 24].rstrip(b"\0")
+
+    def _slice_record(self, i):
+        return SLICE_RECORD.unpack_from(self._map, self._slice_start + i * SLICE_RECORD.size)
+
+    def _slice_key(self, i):
+        # (target_lang, pos) of the i-th slice record as 8 raw bytes
+        start = self._slice_start + i * SLICE_RECORD.size
+        return self._map[start:start + 8]
+
+    def _slice_range(self, lang_key=None, pos_key=None, lo=0):
+        # Range of slice records for a language (and POS); prefixes are bounded by all-zero and all-0xff padding
+        keys = _SliceKeys(self)
+        low = lang_key + (pos_key or b"")
+        high = lang_key + (pos_key or b"\xff" * 4)
+        start = bisect.bisect_left(keys, low.ljust(8, b"\0"), lo)
+        return start, bisect.bisect_right(keys, high.ljust(8, b"\xff"), start)
+
+    def _read_block(self, shard_no, offset, length):
+        with open(os.path.join(self.out_dir, _shard_name(self.stem, shard_no)), "rb") as f:
+            f.seek(offset)
+            return gzip.decompress(f.read(length)).decode("utf-8").splitlines()
+
+    def get(self, task_id):
+        # Binary search over the mapped index; only the block holding the item is decompressed.
+        key = task_id.encode("utf-8")
+        keys = _IndexKeys(self)
+        i = bisect.bisect_left(keys, key)
+        if i == len(self) or keys[i] != key:
+            raise KeyError(task_id)
+        _, _, _, shard_no, offset, length, line_no = self._record(i)
+        return json.loads(self._read_block(shard_no, offset, length)[line_no])
+
+    def iter_slice(self, target_lang=None, pos=None):
+        # Yields all items of a language and/or POS in their original order, decompressing each needed block once.
+        # Binary search over the slice section; without a language, each language is searched for the POS in turn.
+        pos_key = _encode(pos, 4, "pos").ljust(4, b"\0") if pos else None
+        if target_lang:
+            ranges = [self._slice_range(_encode(target_lang, 4, "target_lang").ljust(4, b"\0"), pos_key)]
+        elif pos_key:
+            ranges, start = [], 0
+            while start < self._count:
+                lang_key = self._slice_key(start)[:4]
+                ranges.append(self._slice_range(lang_key, pos_key, start))
+                start = self._slice_range(lang_key, None, start)[1]
+        else:
+            ranges = [(0, self._count)]
+        wanted = sorted(self._slice_record(i)[2:] for start, end in ranges for i in range(start, end))
+
+        current_block, lines = None, None
+        for shard_no, offset, length, line_no in wanted:
+            if current_block != (shard_no, offset):
+                current_block = (shard_no, offset)
+                lines = self._read_block(shard_no, offset, length)
+            yield json.loads(lines[line_no])
+
+
+class _IndexKeys:
+    # Sequence view over the task_ids of the index so bisect can search the mapped file directly.
+
+    def __init__(self, benchmark):
+        self._benchmark = benchmark
+
+    def __len__(self):
+        return len(self._benchmark)
+
+    def __getitem__(self, i):
+        return self._benchmark._key(i)
+
+
+class _SliceKeys(_IndexKeys):
+    # The same view over the (target_lang, pos) keys of the slice section.
+
+    def __getitem__(self, i):
+        return self._benchmark._slice_key(i)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build and query compressed, indexed benchmark shards.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Shard one or more benchmark .jsonl files.")
+    build.add_argument("files", nargs="+")
+    build.add_argument("--out-dir", default="./data/shards")
+    build.add_argument("--shard-max-bytes", type=int, default=SHARD_MAX_BYTES)
+
+    get = commands.add_parser("get", help="Print a single item by task_id.")
+    get.add_argument("index")
+    get.add_argument("task_id")
+
+    slice_ = commands.add_parser("slice", help="Print all items of a language and/or POS.")
+    slice_.add_argument("index")
+    slice_.add_argument("--lang")
+    slice_.add_argument("--pos")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        for path in args.files:
+            stem = os.path.splitext(os.path.basename(path))[0]
+            items = read_jsonl(path)
+            index_path = write_shards(items, args.out_dir, stem, shard_max_bytes=args.shard_max_bytes)
+            print(f"Sharded {len(items)} items from {path}. Index saved to {index_path}")
+    elif args.command == "get":
+        with ShardedBenchmark(args.index) as benchmark:
+            print(json.dumps(benchmark.get(args.task_id), ensure_ascii=False))
+    else:
+        with ShardedBenchmark(args.index) as benchmark:
+            for item in benchmark.iter_slice(target_lang=args.lang, pos=args.pos):
+                print(json.dumps(item, ensure_ascii=False))
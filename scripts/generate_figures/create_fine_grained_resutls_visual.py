@@ -4,8 +4,6 @@
 import os
 import json
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
 import glob
 
 def parse_results(results_directory):
@@ -66,6 +64,10 @@ def parse_results(results_directory):
 
 def plot_fine_grained_performance(df, output_path):
 
+    # The plotting libraries are slow to import and not needed to parse results, so they are loaded here
+    import seaborn as sns
+    import matplotlib.pyplot as plt
+
     if df.empty:
         print("Cannot generate plot because no data was found.")
         return
@@ -1,8 +1,6 @@
 import os
 import json
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
 
 def parse_results(results_directory):
 
@@ -61,6 +59,10 @@ def plot_performance_by_tier(df, output_path):
     Creates a grouped bar chart comparing model performance across language tiers.
 
     """
+    # The plotting libraries are slow to import and not needed to parse results, so they are loaded here
+    import seaborn as sns
+    import matplotlib.pyplot as plt
+
     if df.empty:
         print("Cannot generate 'performance_by_tier' plot because no data was found.")
         return
@@ -92,6 +94,9 @@ def plot_performance_by_tier(df, output_path):
 # Dataset Size chart 
 def plot_dataset_size(df, output_path):
    
+    import seaborn as sns
+    import matplotlib.pyplot as plt
+
     if df.empty:
         print("Cannot generate 'dataset_size' plot because no data was found.")
         return
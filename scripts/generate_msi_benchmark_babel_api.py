@@ -1,16 +1,24 @@
 import requests
 import json
 import random
-import time
 import os
 from dotenv import load_dotenv
 
+# All API requests go through the record/replay cache: repeated requests cost no quota (see http_cache.py)
+import http_cache
+from http_cache import QuotaExhausted
+
 # --- 1. Configuration ---
 
 # Load API Key from a .env file for security
 load_dotenv()
 API_KEY = os.getenv('MY_API_KEY')
 
+# The random fallback distractors decide which requests are sent, so they are seeded: a rerun after a quota stop, or a
+# replay-only run, sends exactly the requests that were recorded before
+RANDOM_SEED = int(os.getenv('BABELNET_RANDOM_SEED', '42'))
+random.seed(RANDOM_SEED)
+
 # Define the languages you want in your benchmark
 TARGET_LANGUAGES = [("DE", "German"), ("FR", "French")]
 SOURCE_LANGUAGE = "EN"
@@ -37,7 +45,7 @@ def get_primary_synset_id(word, pos, lang):
             "source": "WN",
             "key": API_KEY
         }
-        response = requests.get(GET_SYNSER_IDS_URL, params=params)
+        response = http_cache.get(GET_SYNSER_IDS_URL, params=params)
         response.raise_for_status()
         synset_ids = response.json()
         if synset_ids:
@@ -49,13 +57,12 @@ def get_primary_synset_id(word, pos, lang):
 def get_word_from_synset(synset_id, lang):
     """Gets the primary word for a given synset ID in a target language."""
     try:
-        time.sleep(0.5) # Be respectful of the API rate limit
         params = {
             "id": synset_id,
             "targetLang": [lang],
             "key": API_KEY
         }
-        response = requests.get(GET_SYNSER_URL, params=params)
+        response = http_cache.get(GET_SYNSER_URL, params=params)
         response.raise_for_status()
         data = response.json()
         senses = data.get('senses', [])
@@ -77,13 +84,12 @@ def get_distractors(synset_id, target_lang, num_distractors=3):
         if len(distractor_words) >= num_distractors:
             break
         try:
-            time.sleep(0.5)
             params = {
                 "id": synset_id,
                 "relationGroup": relation,
                 "key": API_KEY
             }
-            response = requests.get(GET_EDGES_URL, params=params)
+            response = http_cache.get(GET_EDGES_URL, params=params)
             response.raise_for_status()
             edges = response.json()
 
@@ -106,63 +112,71 @@ def get_distractors(synset_id, target_lang, num_distractors=3):
 # --- 2. Main Generation Loop ---
 benchmark_data = []
 task_counter = 0
-
-for word_to_translate, part_of_speech in SEED_WORDS_WITH_POS:
-    for lang_code, lang_name in TARGET_LANGUAGES:
-        print(f"\nProcessing '{word_to_translate}' ({part_of_speech}) -> {lang_name}...")
-
-        # --- Step A: Get the main concept and the correct answer ---
-        main_synset_id = get_primary_synset_id(word_to_translate, part_of_speech, SOURCE_LANGUAGE)
-        if not main_synset_id:
-            print(f"  -> Could not find main concept for '{word_to_translate}'. Skipping.")
-            continue
+quota_exhausted = False
+
+try:
+    for word_to_translate, part_of_speech in SEED_WORDS_WITH_POS:
+        for lang_code, lang_name in TARGET_LANGUAGES:
+            print(f"\nProcessing '{word_to_translate}' ({part_of_speech}) -> {lang_name}...")
+
+            # --- Step A: Get the main concept and the correct answer ---
+            main_synset_id = get_primary_synset_id(word_to_translate, part_of_speech, SOURCE_LANGUAGE)
+            if not main_synset_id:
+                print(f"  -> Could not find main concept for '{word_to_translate}'. Skipping.")
+                continue
             
-        correct_answer = get_word_from_synset(main_synset_id, lang_code)
-        if not correct_answer:
-            print(f"  -> Could not find translation for '{word_to_translate}'. Skipping.")
-            continue
+            correct_answer = get_word_from_synset(main_synset_id, lang_code)
+            if not correct_answer:
+                print(f"  -> Could not find translation for '{word_to_translate}'. Skipping.")
+                continue
         
-        print(f"  -> Found translation: '{correct_answer}'")
+            print(f"  -> Found translation: '{correct_answer}'")
         
-        # --- Step B: Get high-quality, semantically related distractors ---
-        print("  -> Generating semantic distractors...")
-        distractors = get_distractors(main_synset_id, lang_code)
-        distractors = set(distractors)
-        distractors.discard(correct_answer)
-        # Fallback strategy: If we can't find enough semantic distractors, use random ones.
-        if len(distractors) < 3:
-            print("  -> Not enough semantic distractors found, using random fallback...")
-            distractor_pool = [item for item in SEED_WORDS_WITH_POS if item[0] != word_to_translate]
-            words_for_distractors = random.sample(distractor_pool, 3)
-            for distractor_word_en, distractor_pos in words_for_distractors:
-                distractor_synset_id = get_primary_synset_id(distractor_word_en, distractor_pos, SOURCE_LANGUAGE)
-                if distractor_synset_id:
-                    distractor = get_word_from_synset(distractor_synset_id, lang_code)
-                    if distractor and distractor != correct_answer:
-                        distractors.add(distractor) if isinstance(distractors, set) else distractors.append(distractor)
-
-
-        if len(distractors) < 3:
-            print(f"  -> Could not generate enough distractors. Skipping.")
-            continue
-
-        # --- Step C: Assemble the final JSON object ---
-        choices = list(distractors)[:3] # Ensure exactly 3 distractors
-        choices.append(correct_answer)
-        random.shuffle(choices)
-
-        task_counter += 1
-        data_point = {
-            "task_id": f"CSI-{SOURCE_LANGUAGE}-{lang_code}-{task_counter:03d}",
-            "task_type": "csi_custom_task",
-            "source_word": word_to_translate,
-            "source_lang": SOURCE_LANGUAGE,
-            "target_lang": lang_code,
-            "question": f"Which word has the same meaning as '{word_to_translate}' in {lang_name}?",
-            "choices": choices,
-            "answer": correct_answer
-        }
-        benchmark_data.append(data_point)
+            # --- Step B: Get high-quality, semantically related distractors ---
+            print("  -> Generating semantic distractors...")
+            distractors = get_distractors(main_synset_id, lang_code)
+            distractors = set(distractors)
+            distractors.discard(correct_answer)
+            # Fallback strategy: If we can't find enough semantic distractors, use random ones.
+            if len(distractors) < 3:
+                print("  -> Not enough semantic distractors found, using random fallback...")
+                distractor_pool = [item for item in SEED_WORDS_WITH_POS if item[0] != word_to_translate]
+                words_for_distractors = random.sample(distractor_pool, 3)
+                for distractor_word_en, distractor_pos in words_for_distractors:
+                    distractor_synset_id = get_primary_synset_id(distractor_word_en, distractor_pos, SOURCE_LANGUAGE)
+                    if distractor_synset_id:
+                        distractor = get_word_from_synset(distractor_synset_id, lang_code)
+                        if distractor and distractor != correct_answer:
+                            distractors.add(distractor) if isinstance(distractors, set) else distractors.append(distractor)
+
+
+            if len(distractors) < 3:
+                print(f"  -> Could not generate enough distractors. Skipping.")
+                continue
+
+            # --- Step C: Assemble the final JSON object ---
+            choices = list(distractors)[:3] # Ensure exactly 3 distractors
+            choices.append(correct_answer)
+            random.shuffle(choices)
+
+            task_counter += 1
+            data_point = {
+                "task_id": f"CSI-{SOURCE_LANGUAGE}-{lang_code}-{task_counter:03d}",
+                "task_type": "csi_custom_task",
+                "source_word": word_to_translate,
+                "source_lang": SOURCE_LANGUAGE,
+                "target_lang": lang_code,
+                "question": f"Which word has the same meaning as '{word_to_translate}' in {lang_name}?",
+                "choices": choices,
+                "answer": correct_answer
+            }
+            benchmark_data.append(data_point)
+except QuotaExhausted as e:
+    # Stop cleanly. Everything requested so far is recorded, so running the script again (e.g. tomorrow, when the
+    # quota is reset) replays it from disk for free and continues where this run stopped.
+    quota_exhausted = True
+    print(f"\n  -> Stopping: {e}")
+    print("  -> Rerun the script after the daily quota reset to resume, recorded requests will not be sent again.")
 
 # --- 3. Save the benchmark to a file ---
 output_file = "../data/msi_benchmark_advanced.jsonl"
@@ -170,5 +184,8 @@ with open(output_file, "w", encoding="utf-8") as f:
     for item in benchmark_data:
         f.write(json.dumps(item, ensure_ascii=False) + "\n")
 
-print(f"\n--- DONE ---")
-print(f"Generated {len(benchmark_data)} examples. Saved to {output_file}")
\ No newline at end of file
+print(f"\n--- {'STOPPED (QUOTA)' if quota_exhausted else 'DONE'} ---")
+print(f"Generated {len(benchmark_data)} examples. Saved to {output_file}")
+quota = http_cache.load_quota()
+print(f"API requests: {http_cache.STATS['network']} sent, {http_cache.STATS['hits']} replayed from cache, "
+      f"{http_cache.STATS['misses']} missing in replay mode. Quota used today: {quota['used']}/{http_cache.DAILY_QUOTA}")
\ No newline at end of file
@@ -1,181 +1,425 @@
 # This script is to work with the BabelNet instance via RPC/Docker. I used BabelNet 5.0 for this project
 # It generates separate benchmark files for high, medium, and low-resource languages.
+#
+# Several lexical tasks are generated from the same BabelNet traversal: for every seed word we fetch its synset and the
+# synsets of its hypernyms and meronyms ONCE (the "neighborhood", with the lemmas of every configured language), and all
+# task types and languages are then built from that data without further queries. See TASK_TYPES below.
 
-import babelnet as bn
+import argparse
 import json
 import random
 import os
-
-# Imports for the pybabelnet library's specific types
-from babelnet.language import Language
-from babelnet.pos import POS
-from babelnet.data.source import BabelSenseSource
-from babelnet.data.relation import BabelPointer
-from babelnet.resources import BabelSynsetID
-
+import time
+from collections import Counter
+from types import SimpleNamespace
 
 # from seed_words import SEED_WORDS_WITH_POS
 from seed_words import SEED_WORDS_WITH_POS
 
-
-
 from language_config import LANGUAGE_CONFIG
+from benchmark_io import write_jsonl
+from dataset_shards import write_shards
 
 #  Configuration
-SOURCE_LANGUAGE_ENUM = Language.EN
 SOURCE_LANGUAGE_STR = "EN"
-OUTPUT_DIR = "./data" 
-
-
-# Helper functions 
+SOURCE_LANGUAGE_NAME = "English"
+OUTPUT_DIR = "./data"
+# Also write compressed, indexed shards (see dataset_shards.py) next to the plain .jsonl files
+WRITE_SHARDS = False
+SHARDS_DIR = os.path.join(OUTPUT_DIR, "shards")
+# How many hypernyms / meronyms of a seed synset are fetched (None: all of them). They are shared by all tasks and
+# languages. A cap saves queries, but languages with sparse coverage then fall back to random distractors more often.
+MAX_RELATED_PER_RELATION = None
+NUM_DISTRACTORS = 3
+# Semantic distractor candidates of the synonym task: the first lemmas found in the hypernyms, then the meronyms
+SYNONYM_DISTRACTOR_CANDIDATES = 5
+# Fetched neighborhoods are kept on disk, so reruns (and new task types) do not query BabelNet again
+NEIGHBORHOOD_CACHE_PATH = os.path.join(OUTPUT_DIR, ".cache", "neighborhoods.json")
+# Failed seeds are retried on the next run; after this many failures in a row the server is considered down
+MAX_CONSECUTIVE_FAILURES = 10
+# Used by --dry-run until a real run has measured them
+DEFAULT_SECONDS_PER_CALL = 0.2
+DEFAULT_RELATED_PER_SEED = 4
+
+# Every language we need lemmas for, the source language included (used by the translation task)
+ALL_LANGUAGE_CODES = [SOURCE_LANGUAGE_STR] + [details['code'] for tier in LANGUAGE_CONFIG.values() for details in tier.values()]
+
+# Number of queries sent to BabelNet, per function
+BACKEND_CALLS = Counter()
+
+_synset_id_cache = {}
+_synset_cache = {}
+
+# The babelnet client (and its RPC configuration) is only loaded when we really query BabelNet, not on import or --dry-run
+_babelnet = None
+
+
+def load_babelnet():
+    global _babelnet
+    if _babelnet is None:
+        import babelnet as bn
+        # Imports for the pybabelnet library's specific types
+        from babelnet.language import Language
+        from babelnet.pos import POS
+        from babelnet.data.source import BabelSenseSource
+        from babelnet.data.relation import BabelPointer
+        from babelnet.resources import BabelSynsetID
+        _babelnet = SimpleNamespace(bn=bn, Language=Language, POS=POS, BabelSenseSource=BabelSenseSource,
+                                    BabelPointer=BabelPointer, BabelSynsetID=BabelSynsetID)
+    return _babelnet
+
+
+def use_babelnet(api):
+    # Runs the generator against another backend with the same interface (e.g. the stand-in graph of the benchmarks)
+    global _babelnet
+    _babelnet = api
+    _synset_id_cache.clear()
+    _synset_cache.clear()
+    BACKEND_CALLS.clear()
+
+
+# Helper functions
 
 # The function get ALL the senses of a given word (Word in english and therefor the target language is english - because seed words are english words) and returns the one synset ID that has the given word. This is done by checking the lammas of the returned senses if they match with the target word.
 
-def get_primary_sense_synset(word, lang_code, pos):
-    try:
-        synsets = bn.get_senses(word, from_langs=[Language[lang_code]], poses=[POS[pos]], sources=[BabelSenseSource.WN])
-        if (synsets):
-            for sense in synsets:
-                if sense.full_lemma.lower() == word.lower():
-                    # print('success', word)
-                    return sense.synset_id # returns the first matching element
-            print(f"No exact full_lemma match for '{word}', returning first sense as fallback.")
-            return synsets[0].synset_id #fallback in case not lemmas match
-            
+# Backend errors (connection problems, timeouts) are not caught here: only a real empty answer may be remembered as
+# "no synset", a failed query has to be retried (see fetch_all_neighborhoods).
 
+def get_primary_sense_synset(word, lang_code, pos):
+    cache_key = (word, lang_code, pos)
+    if cache_key in _synset_id_cache:
+        return _synset_id_cache[cache_key]
+
+    api = load_babelnet()
+    synset_id = None
+    BACKEND_CALLS["get_senses"] += 1
+    synsets = api.bn.get_senses(word, from_langs=[api.Language[lang_code]], poses=[api.POS[pos]], sources=[api.BabelSenseSource.WN])
+    if (synsets):
+        for sense in synsets:
+            if sense.full_lemma.lower() == word.lower():
+                # print('success', word)
+                synset_id = sense.synset_id # returns the first matching element
+                break
         else:
-            print(f"No senses found for '{word}' with specified filters.")
-    except Exception as e:
-        print(f" Error finding senses for '{word}' : {e} ")
-    return None
+            print(f"No exact full_lemma match for '{word}', returning first sense as fallback.")
+            synset_id = synsets[0].synset_id #fallback in case not lemmas match
+    else:
+        print(f"No senses found for '{word}' with specified filters.")
+    _synset_id_cache[cache_key] = synset_id
+    return synset_id
+
+
+def get_synset(synset_id):
+    # Every synset is fetched once per run, no matter how many seeds, tasks or languages refer to it
+    cache_key = str(synset_id)
+    if cache_key not in _synset_cache:
+        api = load_babelnet()
+        BACKEND_CALLS["get_synset"] += 1
+        _synset_cache[cache_key] = api.bn.get_synset(api.BabelSynsetID(cache_key))
+    return _synset_cache[cache_key]
+
+
+def get_lemmas(synset):
+    # The primary word of a synset in every configured language (languages without a sense are left out)
+    api = load_babelnet()
+    lemmas = {}
+    for lang_code in ALL_LANGUAGE_CODES:
+        main_sense = synset.main_sense(api.Language[lang_code])
+        if main_sense:
+            lemmas[lang_code] = main_sense.full_lemma.replace("_", " ")
+    return lemmas
 
 
-def get_main_sense_from_synset(synset_id, target_lang_code):
-    # This function gets the primary word for a given synset object in a target language (via its ID)
-    try:
-        synset = bn.get_synset(BabelSynsetID(str(synset_id)))
-        if not synset:
-            return None
-        main_sense = synset.main_sense(Language[target_lang_code])
-        
-        # We can now directly access the senses from the synset object
-        if main_sense:
-            return main_sense.full_lemma.replace("_", " ")
-    except Exception as e:
-        print(f"Error retrieving main sense for synset '{synset_id}' in '{target_lang_code}': {e}")
+# The logic here focuses on the semantically related (hypernym and meronym) synsets, they are the answers of the
+# hypernym/meronym tasks and the polysemous distractors of the others, which makes the benchmark more challenging
+def fetch_neighborhood(word, pos):
+    main_synset_id = get_primary_sense_synset(word, SOURCE_LANGUAGE_STR, pos)
+    if not main_synset_id:
         return None
-
-# The logic here focuses on generating polysomous words for the distractors to make the benchmark more efficient and challenging 
-def get_distractors(main_synset, target_lang_code, num_distractors=3):
-    # Finds semantically related but incorrect words to use as distractors.
+    main_synset = get_synset(main_synset_id)
     if not main_synset:
-        return []
-    distractor_words = set()
+        return None
+
+    neighborhood = {"synset_id": str(main_synset_id), "lemmas": get_lemmas(main_synset)}
 
     # Use BabelPointer Enums for relation types
-    relation_types_to_try = [BabelPointer.ANY_HYPERNYM, BabelPointer.ANY_MERONYM]
-    
-    for rel_type in relation_types_to_try:
-        if len(distractor_words) >= num_distractors:
-            break
+    api = load_babelnet()
+    for relation_name, rel_type in (("hypernyms", api.BabelPointer.ANY_HYPERNYM), ("meronyms", api.BabelPointer.ANY_MERONYM)):
+        related = []
+        for edge in main_synset.outgoing_edges(rel_type)[:MAX_RELATED_PER_RELATION]:
+            # The edge gives us the ID, so we need to fetch the full synset object
+            related_synset = get_synset(edge.target)
+            if related_synset:
+                related.append({"synset_id": str(edge.target), "lemmas": get_lemmas(related_synset)})
+        neighborhood[relation_name] = related
+    return neighborhood
 
-        related_edges = main_synset.outgoing_edges(rel_type)
 
+def related_lemmas(neighborhood, relation_name, lang_code):
+    return [r["lemmas"][lang_code] for r in neighborhood[relation_name] if lang_code in r["lemmas"]]
+
+
+# Task builders. Each one turns a neighborhood into (shown word, source lang, target lang, question, answer, semantic
+# distractors, excluded) for one language, or None when the language lacks the needed lemmas. "excluded" holds every
+# word that would also be a correct answer (e.g. all hypernyms), so no distractor may be one of them. No BabelNet
+# queries happen here.
+
+def build_synonym(word, neighborhood, lang_code, lang_name):
+    answer = neighborhood["lemmas"].get(lang_code)
+    if not answer:
+        return None
+    question = f"Which word has the same meaning as the '{word}' in {lang_name}?"
+    # As the original generator: walk the edges until enough of them have a lemma in this language
+    distractors = related_lemmas(neighborhood, "hypernyms", lang_code) + related_lemmas(neighborhood, "meronyms", lang_code)
+    distractors = list(dict.fromkeys(distractors))[:SYNONYM_DISTRACTOR_CANDIDATES]
+    return word, SOURCE_LANGUAGE_STR, lang_code, question, answer, distractors, {answer}
 
-        for edge in related_edges:
-            # The edge gives us the ID, so we need to fetch the full synset object
-            # related_synset = bn.get_synset(edge.target)
-            related_synset = bn.get_synset(BabelSynsetID(str(edge.target)))
-            if related_synset:
-                distractor = get_main_sense_from_synset(related_synset.id, target_lang_code)
-                if distractor:
-                    distractor_words.add(distractor)
-                    if len(distractor_words) >= num_distractors:
-                        return list(distractor_words)
-    return list(distractor_words)
-
-
-# Main Generation Loop
-
-# Updated to multilingually extend the benchmark and generate data in tiers 
-
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-for tier_name, languages_in_tier in LANGUAGE_CONFIG.items():
-    print(f"\n== Starting Generating for Tier: {tier_name.upper()} ==\n")
-    
-    tier_specific_data = []
-    
-    for lang_enum, lang_details in languages_in_tier.items():
-        lang_code = lang_details['code']
-        lang_name = lang_details['name']
-        print(f"--- Processing Language: {lang_name} ({lang_code}) ---")
-        
-        for word_to_translate, part_of_speech in SEED_WORDS_WITH_POS:
-            #EDIT: Added the detailed print statement back in ---
-            # print(f"  -> Processing '{word_to_translate}'...")
-            # print(word_to_translate)
-            main_synset_id = get_primary_sense_synset(word_to_translate, SOURCE_LANGUAGE_STR,part_of_speech)
-            if not main_synset_id:
-                continue
-                
-            correct_answer = get_main_sense_from_synset(main_synset_id, lang_code)
-            
-            if not correct_answer:
-                continue
-            
-
-            main_synset_obj = bn.get_synset(BabelSynsetID(str(main_synset_id)))
-            distractors = set(get_distractors(main_synset_obj, lang_code, num_distractors=5)) # Get a few extra
-            # Remove the correct answer if it's there - to prevent duplicatoins
-            distractors.discard(correct_answer) 
-
-
-             # Fallback strategy in case there are NOT enough semantic distractors
-            if len(distractors) < 3:
-              
-                distractor_pool = [item for item in SEED_WORDS_WITH_POS if item[0] != word_to_translate]
-                if len(distractor_pool) >= 3:
-                    words_for_distractors = random.sample(distractor_pool, 3)
-                    for distractor_word_en, distractor_pos in words_for_distractors:
-                        distractor_synset_id = get_primary_sense_synset(distractor_word_en, SOURCE_LANGUAGE_STR, distractor_pos)
-                        if distractor_synset_id:
-                            distractor = get_main_sense_from_synset(distractor_synset_id, lang_code)
-                            if distractor and distractor != correct_answer:
-                                distractors.add(distractor)
-
-            if len(distractors) < 3:
-                print(f"  -> Could not generate enough unique distractors. Skipping.")
-                continue
 
-            # Assemble the final JSON object
-            choices = random.sample(list(distractors), 3)
-            choices.append(correct_answer)
-            random.shuffle(choices)
-
-            task_id = f"MSI-{SOURCE_LANGUAGE_STR}-{lang_code}-{len(tier_specific_data) + 1:04d}"
-
-            data_point = {
-                "task_id": task_id,
-                "task_type": "msi_custom_task",
-                "source_word": word_to_translate,
-                "source_lang": SOURCE_LANGUAGE_STR,
-                "target_lang": lang_code,
-                "question": f"Which word has the same meaning as the '{word_to_translate}' in {lang_name}?",
-                "choices": choices,
-                "answer": correct_answer
+def build_hypernym(word, neighborhood, lang_code, lang_name):
+    translation = neighborhood["lemmas"].get(lang_code)
+    hypernyms = [h for h in related_lemmas(neighborhood, "hypernyms", lang_code) if h != translation]
+    if not translation or not hypernyms:
+        return None
+    question = f"Which {lang_name} word is a more general term for '{word}'?"
+    # The translation of the word itself is the hardest distractor: same concept, but not a more general one
+    distractors = [translation] + related_lemmas(neighborhood, "meronyms", lang_code)
+    return word, SOURCE_LANGUAGE_STR, lang_code, question, hypernyms[0], distractors, set(hypernyms)
+
+
+def build_meronym(word, neighborhood, lang_code, lang_name):
+    translation = neighborhood["lemmas"].get(lang_code)
+    meronyms = [m for m in related_lemmas(neighborhood, "meronyms", lang_code) if m != translation]
+    if not translation or not meronyms:
+        return None
+    question = f"Which {lang_name} word names a part or member of '{word}'?"
+    distractors = [translation] + related_lemmas(neighborhood, "hypernyms", lang_code)
+    return word, SOURCE_LANGUAGE_STR, lang_code, question, meronyms[0], distractors, set(meronyms)
+
+
+def build_translation(word, neighborhood, lang_code, lang_name):
+    # Cross-lingual in the other direction: a target-language word has to be mapped back to English
+    shown_word = neighborhood["lemmas"].get(lang_code)
+    answer = neighborhood["lemmas"].get(SOURCE_LANGUAGE_STR, word)
+    if not shown_word:
+        return None
+    question = f"Which {SOURCE_LANGUAGE_NAME} word has the same meaning as the {lang_name} word '{shown_word}'?"
+    distractors = (related_lemmas(neighborhood, "hypernyms", SOURCE_LANGUAGE_STR)
+                   + related_lemmas(neighborhood, "meronyms", SOURCE_LANGUAGE_STR))
+    return shown_word, lang_code, SOURCE_LANGUAGE_STR, question, answer, distractors, {answer}
+
+
+TASK_TYPES = {
+    "synonym": {"task_type": "msi_custom_task", "prefix": "MSI", "build": build_synonym,
+                "output_file": "msi_benchmark_v2_{tier}.jsonl"},
+    "hypernym": {"task_type": "hypernym_custom_task", "prefix": "HYP", "build": build_hypernym,
+                 "output_file": "hypernym_benchmark_{tier}.jsonl"},
+    "meronym": {"task_type": "meronym_custom_task", "prefix": "MER", "build": build_meronym,
+                "output_file": "meronym_benchmark_{tier}.jsonl"},
+    "translation": {"task_type": "translation_custom_task", "prefix": "TRN", "build": build_translation,
+                    "output_file": "translation_benchmark_{tier}.jsonl"},
+}
+TASKS_TO_GENERATE = list(TASK_TYPES)
+
+
+def build_item(task_name, word, pos, neighborhood, lang_code, lang_name, fallback_pool, counter):
+    task = TASK_TYPES[task_name]
+    built = task["build"](word, neighborhood, lang_code, lang_name)
+    if not built:
+        return None
+    shown_word, source_lang, target_lang, question, answer, distractors, excluded = built
+    excluded = excluded | {answer}
+
+    # Remove the correct answer (and every other word that would be correct) if it's there - to prevent duplicatoins
+    distractors = list(dict.fromkeys(d for d in distractors if d not in excluded))
+
+    # Fallback strategy in case there are NOT enough semantic distractors: words of other seeds, already fetched
+    if len(distractors) < NUM_DISTRACTORS:
+        # Seeds often share a translation (big/large -> "groß"), so the pool is deduplicated before sampling
+        candidates = list(dict.fromkeys(w for w in fallback_pool if w not in excluded and w not in distractors))
+        if len(candidates) >= NUM_DISTRACTORS:
+            distractors += random.sample(candidates, NUM_DISTRACTORS - len(distractors))
+
+    if len(distractors) < NUM_DISTRACTORS:
+        return None
+
+    # Assemble the final JSON object
+    choices = random.sample(distractors, NUM_DISTRACTORS)
+    choices.append(answer)
+    random.shuffle(choices)
+
+    return {
+        "task_id": f"{task['prefix']}-{source_lang}-{target_lang}-{counter:04d}",
+        "task_type": task["task_type"],
+        "source_word": shown_word,
+        "source_lang": source_lang,
+        "target_lang": target_lang,
+        "seed_word": word,
+        "pos": pos,
+        "question": question,
+        "choices": choices,
+        "answer": answer
+    }
+
+
+# Neighborhood cache on disk. A seed maps to its neighborhood, or to None when BabelNet has no synset for it. Seeds whose
+# queries failed are not stored, so the next run fetches them again.
+
+def load_neighborhood_cache(path=None):
+    # Returns the cached neighborhoods and the seconds per BabelNet query measured by the run that built them.
+    # A cache built for other languages or another MAX_RELATED_PER_RELATION is ignored.
+    path = path or NEIGHBORHOOD_CACHE_PATH
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}, None
+    if data.get("languages") != ALL_LANGUAGE_CODES or data.get("max_related") != MAX_RELATED_PER_RELATION:
+        print(f"Neighborhood cache {path} was built with other settings, ignoring it.")
+        return {}, None
+    return data["neighborhoods"], data.get("seconds_per_call")
+
+
+def save_neighborhood_cache(neighborhoods, seconds_per_call, path=None):
+    path = path or NEIGHBORHOOD_CACHE_PATH
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"languages": ALL_LANGUAGE_CODES, "max_related": MAX_RELATED_PER_RELATION,
+                   "seconds_per_call": seconds_per_call, "neighborhoods": neighborhoods}, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def seed_key(word, pos):
+    return f"{word}|{pos}"
+
+
+def fetch_all_neighborhoods():
+    # Step 1: one traversal of BabelNet for all seeds, tasks and languages (seeds already in the cache are skipped)
+    cached, seconds_per_call = load_neighborhood_cache()
+    missing = [seed for seed in SEED_WORDS_WITH_POS if seed_key(*seed) not in cached]
+    print(f"\n== Fetching neighborhoods for {len(missing)} of {len(SEED_WORDS_WITH_POS)} seed words "
+          f"({len(SEED_WORDS_WITH_POS) - len(missing)} cached) ==\n")
+
+    start = time.time()
+    failed = []
+    consecutive_failures = 0
+    for i, (word, pos) in enumerate(missing, 1):
+        try:
+            cached[seed_key(word, pos)] = fetch_neighborhood(word, pos)
+            consecutive_failures = 0
+        except Exception as e:
+            # Not cached: a half-fetched neighborhood or a "no synset" caused by an error must not be kept
+            print(f"Error fetching the neighborhood of '{word}' ({pos}), it will be retried on the next run: {e}")
+            failed.append((word, pos))
+            consecutive_failures += 1
+            if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                save_neighborhood_cache(cached, seconds_per_call)
+                raise RuntimeError(f"{consecutive_failures} seeds failed in a row, is the BabelNet server running? "
+                                   f"The {len(cached)} neighborhoods fetched so far are cached.") from e
+        if i % 50 == 0:
+            save_neighborhood_cache(cached, seconds_per_call)
+    if BACKEND_CALLS:
+        seconds_per_call = (time.time() - start) / sum(BACKEND_CALLS.values())
+    if missing:
+        save_neighborhood_cache(cached, seconds_per_call)
+
+    neighborhoods = {seed: cached[seed_key(*seed)] for seed in SEED_WORDS_WITH_POS if cached.get(seed_key(*seed))}
+    print(f"Got {len(neighborhoods)} neighborhoods with {sum(BACKEND_CALLS.values())} BabelNet queries {dict(BACKEND_CALLS)}")
+    if failed:
+        print(f"WARNING: {len(failed)} seeds failed and are missing from this output; rerun to fetch them.")
+    return neighborhoods
+
+
+def dry_run(tasks):
+    # Shows what a run would do and estimates its cost from the neighborhood cache, without connecting to BabelNet
+    print("\n== DRY RUN: nothing is queried or written ==\n")
+    for tier_name, languages_in_tier in LANGUAGE_CONFIG.items():
+        print(f"Tier {tier_name.upper()}: {len(languages_in_tier)} languages ({', '.join(languages_in_tier)})")
+
+    pos_counts = Counter(pos for _, pos in SEED_WORDS_WITH_POS)
+    print(f"\nSeed words: {len(SEED_WORDS_WITH_POS)} ({', '.join(f'{pos}: {n}' for pos, n in pos_counts.items())})")
+    print(f"Task types: {', '.join(tasks)}")
+
+    cached, seconds_per_call = load_neighborhood_cache()
+    missing = [seed for seed in SEED_WORDS_WITH_POS if seed_key(*seed) not in cached]
+    found = [n for n in cached.values() if n]
+    if found:
+        related_per_seed = sum(len(n["hypernyms"]) + len(n["meronyms"]) for n in found) / len(found)
+    else:
+        related_per_seed = DEFAULT_RELATED_PER_SEED
+    seconds_per_call = seconds_per_call or DEFAULT_SECONDS_PER_CALL
+
+    # Upper bound: one get_senses and one get_synset per seed plus one get_synset per related synset
+    estimated_calls = round(len(missing) * (2 + related_per_seed))
+    estimated_seconds = estimated_calls * seconds_per_call
+    num_languages = sum(len(languages) for languages in LANGUAGE_CONFIG.values())
+
+    print(f"\nNeighborhood cache: {len(SEED_WORDS_WITH_POS) - len(missing)} seeds cached, {len(missing)} to fetch "
+          f"({NEIGHBORHOOD_CACHE_PATH})")
+    print(f"Estimated BabelNet queries: ~{estimated_calls} ({related_per_seed:.1f} related synsets per seed, "
+          f"{seconds_per_call:.3f}s per query)")
+    print(f"Estimated wall time: ~{estimated_seconds / 60:.1f} min")
+    print(f"At most {len(SEED_WORDS_WITH_POS) * num_languages * len(tasks)} items "
+          f"({len(SEED_WORDS_WITH_POS)} seeds x {num_languages} languages x {len(tasks)} task types)")
+
+
+def generate(tasks):
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    neighborhoods = fetch_all_neighborhoods()
+
+    # Step 2: build every task type from the fetched data
+    for tier_name, languages_in_tier in LANGUAGE_CONFIG.items():
+        print(f"\n== Starting Generating for Tier: {tier_name.upper()} ==\n")
+
+        tier_specific_data = {task_name: [] for task_name in tasks}
+
+        for lang_code, lang_details in languages_in_tier.items():
+            lang_name = lang_details['name']
+            print(f"--- Processing Language: {lang_name} ({lang_code}) ---")
+
+            fallback_pools = {
+                lang_code: [n["lemmas"][lang_code] for n in neighborhoods.values() if lang_code in n["lemmas"]],
+                SOURCE_LANGUAGE_STR: [n["lemmas"][SOURCE_LANGUAGE_STR] for n in neighborhoods.values() if SOURCE_LANGUAGE_STR in n["lemmas"]],
             }
-            tier_specific_data.append(data_point)
 
-    if tier_specific_data:
-        output_file_path = os.path.join(OUTPUT_DIR, f"msi_benchmark_v2_{tier_name}.jsonl")
-        with open(output_file_path, "w", encoding="utf-8") as f:
-            for item in tier_specific_data:
-                f.write(json.dumps(item, ensure_ascii=False) + "\n")
+            for word_to_translate, part_of_speech in SEED_WORDS_WITH_POS:
+                neighborhood = neighborhoods.get((word_to_translate, part_of_speech))
+                if not neighborhood:
+                    continue
+
+                for task_name in tasks:
+                    # Distractors of the translation task are English words, all others are in the target language
+                    pool = fallback_pools[SOURCE_LANGUAGE_STR if task_name == "translation" else lang_code]
+                    data_point = build_item(task_name, word_to_translate, part_of_speech, neighborhood, lang_code,
+                                            lang_name, pool, len(tier_specific_data[task_name]) + 1)
+                    if data_point:
+                        tier_specific_data[task_name].append(data_point)
+
         print(f"\n--- TIER {tier_name.upper()} DONE ---")
-        print(f"Generated {len(tier_specific_data)} total examples. Saved to {output_file_path}")
+        for task_name, task_data in tier_specific_data.items():
+            if not task_data:
+                print(f"No {task_name} examples were generated for this tier.")
+                continue
+            output_file_name = TASK_TYPES[task_name]["output_file"].format(tier=tier_name)
+            output_file_path = os.path.join(OUTPUT_DIR, output_file_name)
+            write_jsonl(task_data, output_file_path)
+            print(f"Generated {len(task_data)} {task_name} examples. Saved to {output_file_path}")
+            if WRITE_SHARDS:
+                index_path = write_shards(task_data, SHARDS_DIR, os.path.splitext(output_file_name)[0])
+                print(f"Compressed shards and index saved to {index_path}")
+
+    print(f"\nBabelNet queries for the whole run: {sum(BACKEND_CALLS.values())} {dict(BACKEND_CALLS)}")
+    print("\n===== ALL TIERS PROCESSED! =====\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the multilingual lexical benchmark from a local BabelNet.")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="List tiers, languages and seeds and estimate the BabelNet queries and wall time, without connecting.")
+    parser.add_argument("--tasks", nargs="+", choices=list(TASK_TYPES), default=TASKS_TO_GENERATE)
+    args = parser.parse_args()
+
+    if args.dry_run:
+        dry_run(args.tasks)
     else:
-        print(f"\n--- TIER {tier_name.upper()} DONE ---")
-        print(f"No examples were generated for this tier.")
-
-print("\n===== ALL TIERS PROCESSED! =====\n")
\ No newline at end of file
+        generate(args.tasks)
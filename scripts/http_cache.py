@@ -0,0 +1,155 @@
+# Record/replay layer for the BabelNet HTTP API with daily quota accounting.
+#
+# Every successful response is stored on disk, content-addressed by the endpoint and the normalized request parameters
+# (the API key is stripped, so recordings can be shared and do not change when the key does). A request that was made
+# before is answered from disk and costs no quota.
+#
+# Configuration (environment variables, they can also go into the .env file):
+#   BABELNET_CACHE_DIR    where recordings are kept (default ./.babelnet_cache)
+#   BABELNET_CACHE_MODE   record: answer from the cache, otherwise call the API and record the response (default)
+#                         replay: answer from the cache only, never touch the network (reruns, tests)
+#                         off:    always call the API, nothing is recorded
+#   BABELNET_DAILY_QUOTA  number of API requests we allow ourselves per (UTC) day (default 1000, the free key limit)
+
+import datetime
+import hashlib
+import json
+import os
+import time
+
+import requests
+from dotenv import load_dotenv
+
+load_dotenv()
+CACHE_DIR = os.getenv("BABELNET_CACHE_DIR", "./.babelnet_cache")
+CACHE_MODE = os.getenv("BABELNET_CACHE_MODE", "record")
+DAILY_QUOTA = int(os.getenv("BABELNET_DAILY_QUOTA", "1000"))
+REQUEST_DELAY = 0.5  # seconds between real API requests, to be respectful of the rate limit
+SECRET_PARAMS = {"key"}
+
+STATS = {"hits": 0, "misses": 0, "network": 0}
+
+
+class QuotaExhausted(Exception):
+    # Deliberately not a RequestException: it has to stop the whole run instead of being swallowed per request.
+    pass
+
+
+class CacheMiss(requests.exceptions.RequestException):
+    pass
+
+
+class CachedResponse:
+    # The small part of requests.Response that the generator uses.
+
+    def __init__(self, status_code, text, url):
+        self.status_code = status_code
+        self.text = text
+        self.url = url
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+def normalize_params(params):
+    # Sorted keys, lists kept in order, every value as a string, secrets removed.
+    normalized = {}
+    for name, value in sorted((params or {}).items()):
+        if name in SECRET_PARAMS or value is None:
+            continue
+        normalized[name] = [str(v) for v in value] if isinstance(value, (list, tuple)) else str(value)
+    return normalized
+
+
+def cache_key(url, params):
+    payload = json.dumps({"endpoint": url, "params": normalize_params(params)}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cache_path(key):
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.json")
+
+
+def _quota_path():
+    return os.path.join(CACHE_DIR, "quota.json")
+
+
+def _today():
+    return datetime.datetime.now(datetime.timezone.utc).date().isoformat()
+
+
+def load_quota():
+    # Usage of the current UTC day; a new day starts from zero.
+    try:
+        with open(_quota_path(), "r", encoding="utf-8") as f:
+            quota = json.load(f)
+    except (OSError, ValueError):
+        quota = {}
+    if quota.get("date") != _today():
+        quota = {"date": _today(), "used": 0, "exhausted": False}
+    return quota
+
+
+def _save_quota(quota):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = _quota_path() + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(quota, f)
+    os.replace(tmp_path, _quota_path())
+
+
+def _is_quota_error(response):
+    # BabelNet answers an exhausted key with a JSON message instead of data (sometimes with status 200).
+    if response.status_code in (403, 429):
+        return True
+    try:
+        body = response.json()
+    except ValueError:
+        return False
+    return isinstance(body, dict) and "limit" in str(body.get("message", "")).lower()
+
+
+def get(url, params=None):
+    # Drop-in replacement for requests.get(url, params=params) against the BabelNet API.
+    key = cache_key(url, params)
+    path = _cache_path(key)
+
+    if CACHE_MODE != "off" and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            record = json.load(f)
+        STATS["hits"] += 1
+        return CachedResponse(record["status"], record["body"], url)
+
+    if CACHE_MODE == "replay":
+        STATS["misses"] += 1
+        raise CacheMiss(f"No recording for {url} {normalize_params(params)} (replay-only mode)")
+
+    quota = load_quota()
+    if quota["exhausted"] or quota["used"] >= DAILY_QUOTA:
+        raise QuotaExhausted(f"Daily BabelNet quota used up ({quota['used']}/{DAILY_QUOTA} requests on {quota['date']} UTC)")
+
+    time.sleep(REQUEST_DELAY)
+    response = requests.get(url, params=params)
+    STATS["network"] += 1
+    quota["used"] += 1
+
+    if _is_quota_error(response):
+        quota["exhausted"] = True
+        _save_quota(quota)
+        raise QuotaExhausted(f"BabelNet refused the request, the daily limit is reached: {response.text[:200]}")
+    _save_quota(quota)
+
+    if CACHE_MODE != "off" and response.status_code == 200:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        record = {"endpoint": url, "params": normalize_params(params), "status": response.status_code,
+                  "body": response.text, "recorded_at": datetime.datetime.now(datetime.timezone.utc).isoformat()}
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    return CachedResponse(response.status_code, response.text, url)
@@ -1,61 +1,64 @@
-from babelnet import Language
+# The language table is plain data keyed by the BabelNet language code, so tools that only need the table (YAML tooling,
+# analysis, figures) do not import the babelnet client. The generator looks the Language enum up through its lazily
+# loaded client (generate_msi_benchmark_local.load_babelnet).
 
 LANGUAGE_CONFIG = {
     'high_resource': {
-        Language.ES: {'name': 'Spanish', 'code': 'ES'},
-        Language.FR: {'name': 'French', 'code': 'FR'},
-        Language.DE: {'name': 'German', 'code': 'DE'},
-        Language.IT: {'name': 'Italian', 'code': 'IT'},
-        Language.PT: {'name': 'Portuguese', 'code': 'PT'},
-        Language.RU: {'name': 'Russian', 'code': 'RU'},
-        Language.ZH: {'name': 'Chinese', 'code': 'ZH'},
-        Language.JA: {'name': 'Japanese', 'code': 'JA'},
-        Language.KO: {'name': 'Korean', 'code': 'KO'},
-        Language.AR: {'name': 'Arabic', 'code': 'AR'},
-        Language.TR: {'name': 'Turkish', 'code': 'TR'},
-        Language.NL: {'name': 'Dutch', 'code': 'NL'},
-        Language.PL: {'name': 'Polish', 'code': 'PL'},
-        Language.SV: {'name': 'Swedish', 'code': 'SV'},
-        Language.NO: {'name': 'Norwegian', 'code': 'NO'},
-        Language.DA: {'name': 'Danish', 'code': 'DA'},
-        Language.FI: {'name': 'Finnish', 'code': 'FI'},
-        Language.CS: {'name': 'Czech', 'code': 'CS'},
-        Language.RO: {'name': 'Romanian', 'code': 'RO'},
-        Language.HU: {'name': 'Hungarian', 'code': 'HU'},
-        Language.UK: {'name': 'Ukrainian', 'code': 'UK'},
-        Language.HE: {'name': 'Hebrew', 'code': 'HE'},
-        Language.BG: {'name': 'Bulgarian', 'code': 'BG'},
-        Language.EL: {'name': 'Greek', 'code': 'EL'}
+        'ES': {'name': 'Spanish', 'code': 'ES'},
+        'FR': {'name': 'French', 'code': 'FR'},
+        'DE': {'name': 'German', 'code': 'DE'},
+        'IT': {'name': 'Italian', 'code': 'IT'},
+        'PT': {'name': 'Portuguese', 'code': 'PT'},
+        'RU': {'name': 'Russian', 'code': 'RU'},
+        'ZH': {'name': 'Chinese', 'code': 'ZH'},
+        'JA': {'name': 'Japanese', 'code': 'JA'},
+        'KO': {'name': 'Korean', 'code': 'KO'},
+        'AR': {'name': 'Arabic', 'code': 'AR'},
+        'TR': {'name': 'Turkish', 'code': 'TR'},
+        'NL': {'name': 'Dutch', 'code': 'NL'},
+        'PL': {'name': 'Polish', 'code': 'PL'},
+        'SV': {'name': 'Swedish', 'code': 'SV'},
+        'NO': {'name': 'Norwegian', 'code': 'NO'},
+        'DA': {'name': 'Danish', 'code': 'DA'},
+        'FI': {'name': 'Finnish', 'code': 'FI'},
+        'CS': {'name': 'Czech', 'code': 'CS'},
+        'RO': {'name': 'Romanian', 'code': 'RO'},
+        'HU': {'name': 'Hungarian', 'code': 'HU'},
+        'UK': {'name': 'Ukrainian', 'code': 'UK'},
+        'HE': {'name': 'Hebrew', 'code': 'HE'},
+        'BG': {'name': 'Bulgarian', 'code': 'BG'},
+        'EL': {'name': 'Greek', 'code': 'EL'}
     },
 
     'medium_resource': {
-        Language.HR: {'name': 'Croatian', 'code': 'HR'},
-        Language.SR: {'name': 'Serbian', 'code': 'SR'},
-        Language.SK: {'name': 'Slovak', 'code': 'SK'},
-        Language.SL: {'name': 'Slovenian', 'code': 'SL'},
-        Language.LT: {'name': 'Lithuanian', 'code': 'LT'},
-        Language.LV: {'name': 'Latvian', 'code': 'LV'},
-        Language.ET: {'name': 'Estonian', 'code': 'ET'},
-        Language.TH: {'name': 'Thai', 'code': 'TH'},
-        Language.VI: {'name': 'Vietnamese', 'code': 'VI'},
-        Language.MS: {'name': 'Malay', 'code': 'MS'},
-        Language.FA: {'name': 'Persian', 'code': 'FA'},
-        Language.ID: {'name': 'Indonesian', 'code': 'ID'},
-        Language.TA: {'name': 'Tamil', 'code': 'TA'},
-        Language.HI: {'name': 'Hindi', 'code': 'HI'},
-        Language.BN: {'name': 'Bengali', 'code': 'BN'}
+        'HR': {'name': 'Croatian', 'code': 'HR'},
+        'SR': {'name': 'Serbian', 'code': 'SR'},
+        'SK': {'name': 'Slovak', 'code': 'SK'},
+        'SL': {'name': 'Slovenian', 'code': 'SL'},
+        'LT': {'name': 'Lithuanian', 'code': 'LT'},
+        'LV': {'name': 'Latvian', 'code': 'LV'},
+        'ET': {'name': 'Estonian', 'code': 'ET'},
+        'TH': {'name': 'Thai', 'code': 'TH'},
+        'VI': {'name': 'Vietnamese', 'code': 'VI'},
+        'MS': {'name': 'Malay', 'code': 'MS'},
+        'FA': {'name': 'Persian', 'code': 'FA'},
+        'ID': {'name': 'Indonesian', 'code': 'ID'},
+        'TA': {'name': 'Tamil', 'code': 'TA'},
+        'HI': {'name': 'Hindi', 'code': 'HI'},
+        'BN': {'name': 'Bengali', 'code': 'BN'}
     },
 
     'low_resource': {
-        Language.SW: {'name': 'Swahili', 'code': 'SW'},
-        Language.IS: {'name': 'Icelandic', 'code': 'IS'},
-        Language.MT: {'name': 'Maltese', 'code': 'MT'},
-        Language.GA: {'name': 'Irish', 'code': 'GA'},
-        Language.CY: {'name': 'Welsh', 'code': 'CY'},
-        Language.BS: {'name': 'Bosnian', 'code': 'BS'},
-        Language.KA: {'name': 'Georgian', 'code': 'KA'},
-        Language.AM: {'name': 'Amharic', 'code': 'AM'},
-        Language.UZ: {'name': 'Uzbek', 'code': 'UZ'},
-        Language.TL: {'name': 'Tagalog', 'code': 'TL'}
+        'SW': {'name': 'Swahili', 'code': 'SW'},
+        'IS': {'name': 'Icelandic', 'code': 'IS'},
+        'MT': {'name': 'Maltese', 'code': 'MT'},
+        'GA': {'name': 'Irish', 'code': 'GA'},
+        'CY': {'name': 'Welsh', 'code': 'CY'},
+        'BS': {'name': 'Bosnian', 'code': 'BS'},
+        'KA': {'name': 'Georgian', 'code': 'KA'},
+        'AM': {'name': 'Amharic', 'code': 'AM'},
+        'UZ': {'name': 'Uzbek', 'code': 'UZ'},
+        'TL': {'name': 'Tagalog', 'code': 'TL'}
     }
 }
+
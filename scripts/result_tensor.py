@@ -0,0 +1,352 @@
+# Memory-mapped seed-concept x language x model result store for cross-lingual analysis.
+#
+# master_results.csv keeps one accuracy per model and tier. This store keeps every answer: for each seed concept
+# ("word|POS"), language and model it holds whether the model was correct and the log-likelihood of each choice, as
+# memory-mapped NumPy arrays that are updated in place when new runs (lm_eval per-sample logs, see sample_logs.py) arrive.
+#
+# Files in the store directory:
+#   labels.json     concept / language / model labels, array capacities and the samples files already ingested
+#   correct.int8    int8    [language, model, concept]         2 correct, 1 wrong, 0 no result
+#   logliks.f32     float32 [language, model, concept, choice] choice log-likelihoods, the correct answer first and
+#                                                              the distractors after it (only valid where correct > 0)
+#   counts.npz      correct / answered counts per language, model and POS that the queries are answered from,
+#                   recomputed (one pass over correct.int8) after new results were added
+#
+# The arrays are language-major: the questions below read one language ([l]), or one model in every language
+# ([:, m]), as contiguous blocks. "No result" is stored as 0, so new files are sparse and need no initialisation. Model
+# and concept capacities grow by doubling, so a new run is written in place and only rarely triggers a copy. Queries
+# never copy more than one language at a time.
+#
+# Usage:
+#   python scripts/result_tensor.py ingest --results-dir results
+#   python scripts/result_tensor.py hardest --lang SW -k 20
+#   python scripts/result_tensor.py collapse --model gemma-3-1b-it
+#   python scripts/result_tensor.py tier-gap
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+from benchmark_io import attach_pos
+from language_config import LANGUAGE_CONFIG
+from sample_logs import find_sample_files, load_samples_file
+
+DEFAULT_STORE_DIR = "./results/tensor_store"
+NUM_CHOICES = 4
+MISSING, WRONG, CORRECT = 0, 1, 2
+INITIAL_MODEL_CAPACITY = 16
+INITIAL_CONCEPT_CAPACITY = 1024
+LANGUAGE_TIERS = {code: tier for tier, languages in LANGUAGE_CONFIG.items() for code in languages}
+
+
+class ResultTensor:
+
+    def __init__(self, store_dir=DEFAULT_STORE_DIR, task_type="msi_custom_task"):
+        self.store_dir = store_dir
+        labels_path = os.path.join(store_dir, "labels.json")
+        if os.path.exists(labels_path):
+            with open(labels_path, "r", encoding="utf-8") as f:
+                labels = json.load(f)
+        else:
+            labels = {"task_type": task_type, "concepts": [], "languages": list(LANGUAGE_TIERS), "models": [],
+                      "model_capacity": INITIAL_MODEL_CAPACITY, "concept_capacity": INITIAL_CONCEPT_CAPACITY,
+                      "ingested": {}, "revision": 0}
+        self.task_type = labels["task_type"]
+        self.concepts = labels["concepts"]
+        self.languages = labels["languages"]
+        self.models = labels["models"]
+        self.model_capacity = labels["model_capacity"]
+        self.concept_capacity = labels["concept_capacity"]
+        self.ingested = labels["ingested"]
+        # Incremented whenever results are written, so saved counts can be recognised as outdated
+        self.revision = labels.get("revision", 0)
+        self.concept_index = {c: i for i, c in enumerate(self.concepts)}
+        self.language_index = {l: i for i, l in enumerate(self.languages)}
+        self.model_index = {m: i for i, m in enumerate(self.models)}
+        self._counts = None
+        self._open_arrays(create=not os.path.exists(labels_path))
+
+    # Storage
+
+    def _shapes(self, model_capacity, concept_capacity):
+        correct_shape = (len(self.languages), model_capacity, concept_capacity)
+        return correct_shape, correct_shape + (NUM_CHOICES,)
+
+    def _open_arrays(self, create=False):
+        os.makedirs(self.store_dir, exist_ok=True)
+        correct_shape, loglik_shape = self._shapes(self.model_capacity, self.concept_capacity)
+        mode = "w+" if create else "r+"
+        if not create:
+            # Mapping files of another size with these shapes would read every language block from the wrong offset
+            for name, shape, itemsize in (("correct.int8", correct_shape, 1), ("logliks.f32", loglik_shape, 4)):
+                if os.path.getsize(os.path.join(self.store_dir, name)) != int(np.prod(shape)) * itemsize:
+                    raise ValueError(f"{name} in {self.store_dir} does not match the capacities in labels.json; "
+                                     f"the store is inconsistent, rebuild it with 'ingest'")
+        self.correct = np.memmap(os.path.join(self.store_dir, "correct.int8"), dtype=np.int8, mode=mode, shape=correct_shape)
+        self.logliks = np.memmap(os.path.join(self.store_dir, "logliks.f32"), dtype=np.float32, mode=mode, shape=loglik_shape)
+
+    def _grow(self, model_capacity, concept_capacity):
+        # Copies the arrays into bigger ones; the new cells start as "no result" (zero). Only the (language, model)
+        # rows that hold results are copied: they become dense in the new files (which they mostly are already), every
+        # other row stays sparse.
+        old_correct, old_logliks = self.correct, self.logliks
+        c = min(len(self.concepts), self.concept_capacity)  # concepts that can already have results
+        correct_shape, loglik_shape = self._shapes(model_capacity, concept_capacity)
+        paths = {name: os.path.join(self.store_dir, name) for name in ("correct.int8", "logliks.f32")}
+
+        new_correct = np.memmap(paths["correct.int8"] + ".tmp", dtype=np.int8, mode="w+", shape=correct_shape)
+        new_logliks = np.memmap(paths["logliks.f32"] + ".tmp", dtype=np.float32, mode="w+", shape=loglik_shape)
+        for l in range(len(self.languages)):
+            for m in np.flatnonzero(np.count_nonzero(old_correct[l, :, :c], axis=1)):
+                new_correct[l, m, :c] = old_correct[l, m, :c]
+                new_logliks[l, m, :c] = old_logliks[l, m, :c]
+        new_correct.flush()
+        new_logliks.flush()
+        del old_correct, old_logliks, new_correct, new_logliks
+        self.correct = self.logliks = None
+
+        for path in paths.values():
+            os.replace(path + ".tmp", path)
+        self.model_capacity, self.concept_capacity = model_capacity, concept_capacity
+        self._open_arrays()
+        self._save_labels()
+
+    def _save_labels(self):
+        labels = {"task_type": self.task_type, "concepts": self.concepts, "languages": self.languages,
+                  "models": self.models, "model_capacity": self.model_capacity,
+                  "concept_capacity": self.concept_capacity, "ingested": self.ingested, "revision": self.revision}
+        tmp_path = os.path.join(self.store_dir, "labels.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(labels, f, ensure_ascii=False)
+        os.replace(tmp_path, os.path.join(self.store_dir, "labels.json"))
+
+    def _index(self, labels, index, label):
+        if label not in index:
+            index[label] = len(labels)
+            labels.append(label)
+        return index[label]
+
+    # Updates
+
+    def add_records(self, records):
+        # Writes the per-sample records (see sample_logs.load_samples_file) into the arrays, in place.
+        records = [r for r in records if r["doc"].get("task_type", self.task_type) == self.task_type
+                   and r["doc"].get("target_lang") in self.language_index]
+        attach_pos([r["doc"] for r in records])
+
+        cells = []
+        for record in records:
+            doc = record["doc"]
+            concept = f"{doc.get('seed_word', doc.get('source_word'))}|{doc.get('pos', '')}"
+            cells.append((self.language_index[doc["target_lang"]],
+                          self._index(self.models, self.model_index, record["model"]),
+                          self._index(self.concepts, self.concept_index, concept),
+                          record))
+
+        model_capacity, concept_capacity = self.model_capacity, self.concept_capacity
+        while len(self.models) > model_capacity:
+            model_capacity *= 2
+        while len(self.concepts) > concept_capacity:
+            concept_capacity *= 2
+        if (model_capacity, concept_capacity) != (self.model_capacity, self.concept_capacity):
+            self._grow(model_capacity, concept_capacity)
+
+        if cells:
+            self._counts = None
+            self.revision += 1
+            # New models/concepts and the revision are saved before any cell is written, so a crash while writing
+            # never leaves data under an index that labels.json does not know (and a later label would inherit)
+            self._save_labels()
+            l, m, c = (np.array(axis, dtype=np.int64) for axis in list(zip(*cells))[:3])
+            self.correct[l, m, c] = [CORRECT if cell[3]["correct"] >= 0.5 else WRONG for cell in cells]
+            logliks = np.full((len(cells), NUM_CHOICES), np.nan, dtype=np.float32)
+            for i, cell in enumerate(cells):
+                logliks[i] = self._gold_first(cell[3])
+            self.logliks[l, m, c] = logliks
+        return len(cells)
+
+    @staticmethod
+    def _gold_first(record):
+        # Choice order differs per item, so the correct answer is moved to position 0
+        values = (record["logliks"] + [np.nan] * NUM_CHOICES)[:NUM_CHOICES]
+        choices = record["doc"].get("choices", [])
+        gold = choices.index(record["doc"]["answer"]) if record["doc"].get("answer") in choices else 0
+        if gold >= NUM_CHOICES:
+            return [np.nan] * NUM_CHOICES
+        return [values[gold]] + values[:gold] + values[gold + 1:]
+
+    def ingest(self, results_directory):
+        # Adds every samples file that is new or changed since it was last ingested.
+        added = 0
+        for samples_path in find_sample_files(results_directory):
+            stamp = os.path.getmtime(samples_path)
+            if self.ingested.get(samples_path) == stamp:
+                continue
+            added += self.add_records(load_samples_file(samples_path))
+            self.ingested[samples_path] = stamp
+            # Every file is committed on its own, so an interrupted ingest keeps what it has added so far
+            self.flush()
+        return added
+
+    def flush(self):
+        self.correct.flush()
+        self.logliks.flush()
+        self._save_labels()
+
+    # Queries
+
+    def _used(self, array):
+        # Basic slices only, so this is a view and nothing is copied
+        return array[..., :len(self.models), :len(self.concepts)]
+
+    def _concept_mask(self, pos=None):
+        if not pos:
+            return np.ones(len(self.concepts), dtype=bool)
+        return np.array([concept.rsplit("|", 1)[1] == pos for concept in self.concepts], dtype=bool)
+
+    @staticmethod
+    def _hits_answered(block, axis):
+        # Correct and answered counts over an axis. With 0 missing, 1 wrong and 2 correct, the sum of the cells is
+        # hits + answered, so no boolean array of the block's size is needed for the hits.
+        answered = np.count_nonzero(block, axis=axis)
+        return block.sum(axis=axis, dtype=np.int64) - answered, answered
+
+    @staticmethod
+    def _ratio(hits, answered):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(answered > 0, hits / np.maximum(answered, 1), np.nan)
+
+    def _load_counts(self):
+        try:
+            with np.load(os.path.join(self.store_dir, "counts.npz")) as data:
+                if int(data["revision"]) != self.revision:
+                    return None
+                keys = [None] + [str(pos) for pos in data["poses"]]
+                return {pos: (data["hits"][i], data["answered"][i]) for i, pos in enumerate(keys)}
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _save_counts(self, counts):
+        poses = [pos for pos in counts if pos is not None]
+        tmp_path = os.path.join(self.store_dir, "counts.npz.tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, revision=self.revision, poses=np.array(poses, dtype=str),
+                     hits=np.stack([counts[pos][0] for pos in [None] + poses]),
+                     answered=np.stack([counts[pos][1] for pos in [None] + poses]))
+        os.replace(tmp_path, os.path.join(self.store_dir, "counts.npz"))
+
+    def _model_counts(self):
+        # {POS (None: all concepts): (hits, answered)}, both [language, model]. Computed in one pass that reads one
+        # language at a time and saved in counts.npz until new results are added; the queries below only combine them.
+        if self._counts is None:
+            self._counts = self._load_counts()
+        if self._counts is None:
+            concept_poses = [concept.rsplit("|", 1)[1] for concept in self.concepts]
+            poses = sorted(set(concept_poses))
+            codes = np.array([poses.index(pos) for pos in concept_poses], dtype=np.int64)
+            # Concepts grouped by POS, so the counts of every POS are sums over contiguous column ranges
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(poses) + 1))
+            shape = (len(self.languages), len(self.models))
+            counts = {pos: (np.zeros(shape, dtype=np.int64), np.zeros(shape, dtype=np.int64)) for pos in [None] + poses}
+            # One language is copied at a time, into buffers that are reused for every language
+            grouped = np.empty((len(self.models), len(self.concepts)), dtype=np.int8)  # [model, concept]
+            answered_cells = np.empty(grouped.shape, dtype=bool)
+            for l in range(len(self.languages)):
+                np.take(np.asarray(self._used(self.correct[l])), order, axis=1, out=grouped)
+                np.not_equal(grouped, MISSING, out=answered_cells)
+                for p, pos in enumerate(poses):
+                    columns = slice(bounds[p], bounds[p + 1])
+                    answered = answered_cells[:, columns].sum(axis=1, dtype=np.int32)
+                    counts[pos][0][l] = grouped[:, columns].sum(axis=1, dtype=np.int32) - answered
+                    counts[pos][1][l] = answered
+                counts[None][0][l] = sum(counts[pos][0][l] for pos in poses)
+                counts[None][1][l] = sum(counts[pos][1][l] for pos in poses)
+            self._counts = counts
+            self._save_counts(counts)
+        return self._counts
+
+    def hardest_concepts(self, lang, k=20, pos=None):
+        # Concepts of a language with the lowest accuracy across models: [(concept, accuracy, models answered)]
+        block = np.asarray(self._used(self.correct[self.language_index[lang]]))  # [model, concept]
+        hits, answered = self._hits_answered(block, axis=0)
+        accuracy = self._ratio(hits, answered)
+        candidates = np.flatnonzero(self._concept_mask(pos) & (answered > 0))
+        order = candidates[np.argsort(accuracy[candidates], kind="stable")][:k]
+        return [(self.concepts[i], float(accuracy[i]), int(answered[i])) for i in order]
+
+    def collapsed_languages(self, model, k=10):
+        # Languages where a model falls furthest below the other models:
+        # [(language, model accuracy, accuracy of the other models, gap)]
+        hits, answered = self._model_counts()[None]
+        m = self.model_index[model]
+        model_accuracy = self._ratio(hits[:, m], answered[:, m])
+        # The other models are everything minus this one
+        others_accuracy = self._ratio(hits.sum(axis=1) - hits[:, m], answered.sum(axis=1) - answered[:, m])
+        gap = model_accuracy - others_accuracy
+        candidates = np.flatnonzero(~np.isnan(gap))
+        order = candidates[np.argsort(gap[candidates], kind="stable")][:k]
+        return [(self.languages[i], float(model_accuracy[i]), float(others_accuracy[i]), float(gap[i])) for i in order]
+
+    def margins(self, lang):
+        # [model, concept] log-likelihood of the correct answer minus the best distractor (NaN where no result);
+        # negative means the model preferred a distractor, small positive values mean it barely got it right
+        l = self.language_index[lang]
+        logliks = self.logliks[l, :len(self.models), :len(self.concepts)]  # [model, concept, choice]
+        margin = logliks[..., 0] - np.nanmax(logliks[..., 1:], axis=-1)
+        return np.where(self._used(self.correct[l]) != MISSING, margin, np.nan)
+
+    def tier_gap(self, pos=None):
+        # Accuracy per model and tier for one POS (or all), plus the high - low resource gap
+        shape = (len(self.languages), len(self.models))
+        hits, answered = self._model_counts().get(pos, (np.zeros(shape, dtype=np.int64),) * 2)
+        per_model = {model: {} for model in self.models}
+        for tier in LANGUAGE_CONFIG:
+            rows = [i for i, lang in enumerate(self.languages) if LANGUAGE_TIERS.get(lang) == tier]
+            accuracy = self._ratio(hits[rows].sum(axis=0), answered[rows].sum(axis=0))
+            for model, value in zip(self.models, accuracy):
+                per_model[model][tier] = float(value)
+        for values in per_model.values():
+            values["gap"] = values["high_resource"] - values["low_resource"]
+        return per_model
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concept x language x model result store and its queries.")
+    parser.add_argument("--store", default=DEFAULT_STORE_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="Add new per-sample logs (lm_eval --log_samples) to the store.")
+    ingest.add_argument("--results-dir", default="./results")
+
+    hardest = commands.add_parser("hardest", help="Hardest concepts of a language.")
+    hardest.add_argument("--lang", required=True)
+    hardest.add_argument("--pos")
+    hardest.add_argument("-k", type=int, default=20)
+
+    collapse = commands.add_parser("collapse", help="Languages where a model collapses compared to the others.")
+    collapse.add_argument("--model", required=True)
+    collapse.add_argument("-k", type=int, default=10)
+
+    tier_gap = commands.add_parser("tier-gap", help="High vs low resource gap per model, for every POS.")
+
+    args = parser.parse_args()
+    store = ResultTensor(args.store)
+
+    if args.command == "ingest":
+        added = store.ingest(args.results_dir)
+        print(f"Added {added} results. Store now has {len(store.models)} models, {len(store.concepts)} concepts "
+              f"and {len(store.languages)} languages ({args.store})")
+    elif args.command == "hardest":
+        for concept, accuracy, answered in store.hardest_concepts(args.lang, k=args.k, pos=args.pos):
+            print(f"{concept:<30} {accuracy:6.1%}  ({answered} models)")
+    elif args.command == "collapse":
+        for lang, model_accuracy, others_accuracy, gap in store.collapsed_languages(args.model, k=args.k):
+            print(f"{lang:<4} {model_accuracy:6.1%} vs {others_accuracy:6.1%} for the other models ({gap:+.1%})")
+    else:
+        for pos in (None, "NOUN", "VERB", "ADJ"):
+            print(f"\n--- {pos or 'ALL'} ---")
+            for model, values in store.tier_gap(pos).items():
+                print(f"{model:<30} high {values['high_resource']:6.1%} | medium {values['medium_resource']:6.1%} "
+                      f"| low {values['low_resource']:6.1%} | gap {values['gap']:+.1%}")
@@ -0,0 +1,184 @@
+# Runs a sweep of models x tasks with lm-evaluation-harness, loading every model only ONCE.
+#
+# Running `lm_eval` per task loads the (multi-GB) model again for every tier/POS config. This script reads a manifest
+# (see sweep_manifest.yml), groups the pending work by model, loads each model a single time and scores all its tasks in
+# that session. It writes one results file per task in the naming scheme of results/ (hr_llama3_results_<time>.json,
+# hr-nouns_llama3_results_<time>.json, ...) and skips model/task pairs that already have a results file.
+#
+# Usage:
+#   python scripts/run_evaluation_sweep.py sweep_manifest.yml
+#   python scripts/run_evaluation_sweep.py sweep_manifest.yml --dry-run      # show what would run
+#   python scripts/run_evaluation_sweep.py sweep_manifest_cpu.yml --limit 20   # quick CPU-only check with gpt2
+#   python scripts/run_evaluation_sweep.py sweep_manifest.yml --models gemma3    # only some models of a manifest
+
+import argparse
+import datetime
+import gc
+import glob
+import json
+import os
+import re
+
+import yaml
+
+from sample_logs import TIER_SHORT_NAMES, tier_from_task
+
+
+def discover_tasks(include_path):
+    # task name -> yaml file, for every task config in the include path
+    tasks = {}
+    for yaml_path in sorted(glob.glob(os.path.join(include_path, "*.yaml"))):
+        with open(yaml_path, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f) or {}
+        if "task" in config:
+            tasks[config["task"]] = yaml_path
+    return tasks
+
+
+def results_prefix(task_name):
+    # msi_custom_task_high_resource -> hr, msi_custom_task_high_resource_nouns -> hr-nouns,
+    # hypernym_custom_task_low_resource -> lr-hypernym, msi_custom_task_medium_resource_lite -> mr-lite
+    tier = tier_from_task(task_name)
+    if not tier:
+        return task_name
+    kind, _, variant = task_name.partition(f"_custom_task_{tier}")
+    parts = [TIER_SHORT_NAMES[tier]]
+    if kind != "msi":
+        parts.append(kind)
+    if variant:
+        parts.append(variant.lstrip("_"))
+    return "-".join(parts)
+
+
+def has_results(output_dir, task_name, alias):
+    return bool(glob.glob(os.path.join(output_dir, f"{glob.escape(results_prefix(task_name))}_{glob.escape(alias)}_results_*.json")))
+
+
+def load_manifest(path, models=None):
+    # models: optional list of aliases, only these models of the manifest are kept
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = yaml.safe_load(f)
+    manifest.setdefault("include_path", "lm_harness_tasks")
+    manifest.setdefault("output_dir", "results/Sweep")
+    manifest.setdefault("batch_size", "auto")
+    manifest.setdefault("tasks", "all")
+    for model in manifest["models"]:
+        model.setdefault("alias", model["pretrained"].split("/")[-1])
+    if models:
+        unknown = sorted(set(models) - {model["alias"] for model in manifest["models"]})
+        if unknown:
+            raise ValueError(f"Unknown model alias(es) in {path}: {', '.join(unknown)}")
+        manifest["models"] = [model for model in manifest["models"] if model["alias"] in models]
+    return manifest
+
+
+def plan_sweep(manifest, available_tasks):
+    # [(model entry, [pending task names])], grouped by model so each model is loaded once
+    plan = []
+    for model in manifest["models"]:
+        requested = model.get("tasks", manifest["tasks"])
+        task_names = sorted(available_tasks) if requested == "all" else list(requested)
+        unknown = [t for t in task_names if t not in available_tasks]
+        if unknown:
+            raise ValueError(f"Unknown task(s) for {model['alias']}: {', '.join(unknown)}")
+        pending = [t for t in task_names if not has_results(manifest["output_dir"], t, model["alias"])]
+        plan.append((model, pending))
+    return plan
+
+
+def split_results(results, task_name, model):
+    # One file per task, shaped like the results files lm_eval writes for a single task
+    per_task = {key: value for key, value in results.items() if key not in ("samples", "results", "configs", "versions",
+                                                                          "n-shot", "higher_is_better", "n-samples")}
+    for key in ("results", "configs", "versions", "n-shot", "higher_is_better", "n-samples"):
+        if task_name in results.get(key, {}):
+            per_task[key] = {task_name: results[key][task_name]}
+    per_task["model_name"] = model["pretrained"]
+    per_task["model_name_sanitized"] = re.sub(r"[\"<>:/|\\?*\[\]]+", "__", model["pretrained"])
+    return per_task
+
+
+def load_model(model, batch_size):
+    # lm_eval and torch are heavy, they are only imported when a model really has to be loaded
+    import torch
+    from lm_eval.models.huggingface import HFLM
+
+    device = model.get("device") or ("cuda" if torch.cuda.is_available() else "cpu")
+    dtype = model.get("dtype", "auto")
+    if device == "cpu" and dtype in ("float16", "half"):
+        print(f"  -> {dtype} is not well supported on CPU, using float32 for {model['alias']}")
+        dtype = "float32"
+    return HFLM(pretrained=model["pretrained"], dtype=dtype, device=device, batch_size=batch_size,
+                **model.get("model_args", {}))
+
+
+def run_sweep(manifest, limit=None, log_samples=True):
+    from lm_eval import simple_evaluate
+    from lm_eval.tasks import TaskManager
+
+    available_tasks = discover_tasks(manifest["include_path"])
+    task_manager = TaskManager(include_path=manifest["include_path"])
+    os.makedirs(manifest["output_dir"], exist_ok=True)
+
+    for model, pending in plan_sweep(manifest, available_tasks):
+        if not pending:
+            print(f"\n--- {model['alias']}: all tasks already have results, skipping ---")
+            continue
+
+        print(f"\n== Loading {model['pretrained']} once for {len(pending)} task(s) ==")
+        lm = load_model(model, manifest["batch_size"])
+        results = simple_evaluate(model=lm, tasks=pending, task_manager=task_manager, limit=limit,
+                                  log_samples=log_samples)
+
+        timestamp = datetime.datetime.now().isoformat().replace(":", "-")
+        for task_name in pending:
+            # Without results the pair must stay pending: an empty file would mark it as done for good
+            if task_name not in results.get("results", {}):
+                print(f"WARNING: no results for {task_name} with {model['alias']}, nothing written; it runs again next time")
+                continue
+            per_task = split_results(results, task_name, model)
+            output_file = os.path.join(manifest["output_dir"],
+                                       f"{results_prefix(task_name)}_{model['alias']}_results_{timestamp}.json")
+            with open(output_file, "w", encoding="utf-8") as f:
+                json.dump(per_task, f, indent=2, default=str, ensure_ascii=False)
+            print(f"Saved {task_name} results to {output_file}")
+
+            # Per-sample logs in the layout lm_eval uses, so build_lite_subset.py and the analysis tools find them
+            if log_samples and task_name in results.get("samples", {}):
+                samples_dir = os.path.join(manifest["output_dir"], "samples", per_task["model_name_sanitized"])
+                os.makedirs(samples_dir, exist_ok=True)
+                with open(os.path.join(samples_dir, f"samples_{task_name}_{timestamp}.jsonl"), "w", encoding="utf-8") as f:
+                    for sample in results["samples"][task_name]:
+                        f.write(json.dumps(sample, default=str, ensure_ascii=False) + "\n")
+
+        # Free the model before the next one is loaded
+        del lm, results
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate every model of a manifest on all its tasks, loading each model once.")
+    parser.add_argument("manifest", help="YAML file with the models and tasks of the sweep (see sweep_manifest.yml)")
+    parser.add_argument("--limit", type=int, default=None, help="Only evaluate the first N items of each task (quick checks).")
+    parser.add_argument("--no-log-samples", action="store_true", help="Do not write per-sample logs.")
+    parser.add_argument("--models", nargs="+", default=None, help="Only run these model aliases of the manifest.")
+    parser.add_argument("--output-dir", default=None, help="Overrides output_dir of the manifest (e.g. for --limit runs).")
+    parser.add_argument("--dry-run", action="store_true", help="Only print which model/task pairs would be evaluated.")
+    args = parser.parse_args()
+
+    manifest = load_manifest(args.manifest, models=args.models)
+    if args.output_dir:
+        manifest["output_dir"] = args.output_dir
+    if args.dry_run:
+        for model, pending in plan_sweep(manifest, discover_tasks(manifest["include_path"])):
+            print(f"{model['alias']} ({model['pretrained']}): {len(pending)} task(s) to run")
+            for task_name in pending:
+                print(f"  {task_name} -> {results_prefix(task_name)}_{model['alias']}_results_<time>.json")
+    else:
+        run_sweep(manifest, limit=args.limit, log_samples=not args.no_log_samples)
@@ -0,0 +1,98 @@
+# Helpers for the per-sample logs that lm-evaluation-harness writes when it is run with --log_samples.
+#
+# lm_eval stores them next to the aggregated results as
+#   <output_path>/<model_name_sanitized>/samples_<task>_<timestamp>.jsonl
+#   <output_path>/<model_name_sanitized>/results_<timestamp>.json
+# Every line of a samples file holds the original benchmark item ("doc"), the per-sample metric ("acc") and the
+# log-likelihood of every choice ("filtered_resps").
+
+import glob
+import json
+import os
+import re
+
+from benchmark_io import read_jsonl
+
+TIER_SHORT_NAMES = {"high_resource": "hr", "medium_resource": "mr", "low_resource": "lr"}
+POS_SUFFIXES = {"nouns": "NOUN", "verbs": "VERB", "adjs": "ADJ"}
+
+
+def tier_from_task(task_name):
+    # msi_custom_task_high_resource_nouns -> "high_resource"
+    for tier in TIER_SHORT_NAMES:
+        if tier in task_name:
+            return tier
+    return None
+
+
+def pos_from_task(task_name):
+    # msi_custom_task_high_resource_nouns -> "NOUN"; None for tasks that are not split by POS
+    for suffix, pos in POS_SUFFIXES.items():
+        if task_name.endswith(f"_{suffix}"):
+            return pos
+    return None
+
+
+def item_key(doc):
+    # The same item appears in the full tier file and in the POS files under different task_ids,
+    # so samples are matched on what the question actually asks.
+    return (doc.get("target_lang"), doc.get("source_word"), doc.get("answer"))
+
+
+def _model_name(samples_path):
+    # Prefer the model name recorded in the results file of the same run, fall back to the directory name.
+    directory = os.path.dirname(samples_path)
+    for results_path in sorted(glob.glob(os.path.join(directory, "results_*.json"))):
+        try:
+            with open(results_path, "r", encoding="utf-8") as f:
+                return json.load(f)["model_name"].split("/")[-1]
+        except (OSError, ValueError, KeyError):
+            continue
+    return os.path.basename(directory).split("__")[-1]
+
+
+def _logliks(sample):
+    logliks = []
+    for resp in sample.get("filtered_resps") or []:
+        value = resp[0] if isinstance(resp, (list, tuple)) else resp
+        try:
+            logliks.append(float(value))
+        except (TypeError, ValueError):
+            logliks.append(float("nan"))
+    return logliks
+
+
+def find_sample_files(results_directory):
+    search_path = os.path.join(results_directory, "**", "samples_*.jsonl")
+    return sorted(glob.glob(search_path, recursive=True))
+
+
+def load_samples_file(samples_path):
+    # Returns one record per logged sample of a single samples file, in doc_id order.
+    match = re.match(r"samples_(.+)_\d{4}-\d{2}-\d{2}T[\d\-.]+\.jsonl$", os.path.basename(samples_path))
+    task_name = match.group(1) if match else os.path.basename(samples_path)[len("samples_"):-len(".jsonl")]
+    model_name = _model_name(samples_path)
+    # The POS of a POS-split task is known from its name; attach_pos() only has to guess it for older full-tier files
+    task_pos = pos_from_task(task_name)
+    records = []
+    for sample in sorted(read_jsonl(samples_path), key=lambda sample: sample.get("doc_id", 0)):
+        doc = sample.get("doc", {})
+        if task_pos and not doc.get("pos"):
+            doc["pos"] = task_pos
+        records.append({
+            "model": model_name,
+            "task": task_name,
+            "tier": tier_from_task(task_name),
+            "doc": doc,
+            "correct": float(sample.get("acc", 0.0)),
+            "logliks": _logliks(sample),
+        })
+    return records
+
+
+def load_sample_logs(results_directory):
+    # Returns one record per logged sample found anywhere under results_directory.
+    records = []
+    for samples_path in find_sample_files(results_directory):
+        records.extend(load_samples_file(samples_path))
+    return records